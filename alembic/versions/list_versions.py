@@ -0,0 +1,34 @@
+"""create_incident_list_versions_table
+
+Revision ID: 004
+Revises: 003
+
+"""
+from datetime import datetime, timezone
+
+from alembic import op
+import sqlalchemy as sa
+
+# Идентификаторы версии
+revision = '004'
+down_revision = '003'
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    # Версии списков инцидентов по статусам для условных GET-запросов
+    list_versions = op.create_table('incident_list_versions',
+        sa.Column('status', sa.String(20), nullable=False, primary_key=True),
+        sa.Column('version', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('updated_at', sa.DateTime(), nullable=False)
+    )
+    # Строки всех статусов создаются заранее, чтобы версии увеличивались
+    # только через UPDATE без конфликтов вставки при конкурентных записях
+    now = datetime.now(timezone.utc)
+    op.bulk_insert(list_versions, [
+        {'status': status, 'version': 0, 'updated_at': now}
+        for status in ('pending', 'in progress', 'solved')
+    ])
+
+def downgrade():
+    op.drop_table('incident_list_versions')
@@ -0,0 +1,37 @@
+"""create_outbox_events_table
+
+Revision ID: 003
+Revises: 002
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# Идентификаторы версии
+revision = '003'
+down_revision = '002'
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    # События для внешних систем (transactional outbox)
+    op.create_table('outbox_events',
+        sa.Column('id', sa.Integer(), nullable=False, primary_key=True, autoincrement=True),
+        sa.Column('event_type', sa.String(50), nullable=False),
+        sa.Column('incident_id', sa.Integer(), nullable=False),
+        sa.Column('payload', sa.Text(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('attempts', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('next_attempt_at', sa.DateTime(), nullable=True),
+        sa.Column('claim_token', sa.String(36), nullable=True),
+        sa.Column('claimed_until', sa.DateTime(), nullable=True),
+        sa.Column('last_error', sa.Text(), nullable=True),
+        sqlite_autoincrement=True
+    )
+    op.create_index('ix_outbox_events_next_attempt_at', 'outbox_events', ['next_attempt_at'])
+    op.create_index('ix_outbox_events_claim_token', 'outbox_events', ['claim_token'])
+
+def downgrade():
+    op.drop_index('ix_outbox_events_claim_token', 'outbox_events')
+    op.drop_index('ix_outbox_events_next_attempt_at', 'outbox_events')
+    op.drop_table('outbox_events')
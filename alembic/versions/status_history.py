@@ -0,0 +1,33 @@
+"""create_incident_status_changes_table
+
+Revision ID: 002
+Revises: 001
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# Идентификаторы версии
+revision = '002'
+down_revision = '001'
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    # Журнал переходов статусов инцидентов (только дополняется)
+    op.create_table('incident_status_changes',
+        sa.Column('id', sa.Integer(), nullable=False, primary_key=True, autoincrement=True),
+        sa.Column('incident_id', sa.Integer(), sa.ForeignKey('incidents.id'), nullable=False),
+        sa.Column('old_status', sa.String(20), nullable=False),
+        sa.Column('new_status', sa.String(20), nullable=False),
+        sa.Column('changed_at', sa.DateTime(), nullable=False)
+    )
+    op.create_index(
+        'ix_incident_status_changes_incident_id_changed_at',
+        'incident_status_changes',
+        ['incident_id', 'changed_at']
+    )
+
+def downgrade():
+    op.drop_index('ix_incident_status_changes_incident_id_changed_at', 'incident_status_changes')
+    op.drop_table('incident_status_changes')
@@ -0,0 +1,149 @@
+"""
+Бенчмарк холодного старта API.
+
+Измеряет две величины:
+    1. Время импорта модуля main по данным `python -X importtime`
+       (общее время и самые тяжелые модули по собственному времени).
+    2. Время до первого ответа (time-to-first-response): от запуска
+       процесса uvicorn до первого успешного ответа GET /incidents/,
+       а также медианную задержку последующих (прогретых) запросов.
+
+Пример запуска из корня репозитория:
+    python scripts/bench_startup.py --runs 5
+"""
+import argparse
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SRC_DIR = os.path.join(ROOT_DIR, "src")
+
+
+def _parse_importtime(stderr: str):
+    """
+    Разбирает вывод `-X importtime`.
+
+    Returns:
+        tuple: (общее время импорта main в мс, список (self_us, module))
+    """
+    total_us = 0
+    modules = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        name = name.strip()
+        modules.append((int(self_us), name))
+        if name == "main":
+            total_us = int(cumulative_us)
+    modules.sort(reverse=True)
+    return total_us / 1000, modules
+
+
+def measure_import_time(top: int):
+    """Запускает отдельный интерпретатор и замеряет импорт модуля main."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import main"],
+        cwd=SRC_DIR,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    total_ms, modules = _parse_importtime(result.stderr)
+    return total_ms, modules[:top]
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _get(url: str) -> None:
+    with urllib.request.urlopen(url, timeout=1) as response:
+        response.read()
+
+
+def measure_first_response(path: str, timeout: float, warm_requests: int):
+    """
+    Запускает uvicorn и ждет первого ответа 200 на указанный путь.
+
+    Returns:
+        tuple: (время до первого ответа в мс, медиана прогретых запросов в мс)
+    """
+    port = _free_port()
+    url = f"http://127.0.0.1:{port}{path}"
+    started = time.perf_counter()
+    process = subprocess.Popen(
+        [
+            sys.executable, "-m", "uvicorn", "main:app",
+            "--app-dir", SRC_DIR,
+            "--port", str(port),
+            "--log-level", "warning",
+        ],
+        cwd=ROOT_DIR,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        while time.perf_counter() - started < timeout:
+            try:
+                _get(url)
+                break
+            except (urllib.error.URLError, ConnectionError):
+                time.sleep(0.005)
+        else:
+            raise TimeoutError(f"Сервер не ответил на {url} за {timeout} с")
+        first_response_ms = (time.perf_counter() - started) * 1000
+
+        warm = []
+        for _ in range(warm_requests):
+            request_started = time.perf_counter()
+            _get(url)
+            warm.append((time.perf_counter() - request_started) * 1000)
+        return first_response_ms, statistics.median(warm) if warm else 0.0
+    finally:
+        process.terminate()
+        process.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Бенчмарк холодного старта API")
+    parser.add_argument("--runs", type=int, default=5, help="Количество запусков")
+    parser.add_argument("--top", type=int, default=10, help="Сколько тяжелых модулей показать")
+    parser.add_argument("--path", default="/incidents/?status=pending", help="Путь первого запроса")
+    parser.add_argument("--warm-requests", type=int, default=20, help="Прогретых запросов после первого")
+    parser.add_argument("--timeout", type=float, default=30.0, help="Таймаут ожидания ответа, с")
+    args = parser.parse_args()
+
+    import_times = []
+    heaviest = []
+    for _ in range(args.runs):
+        total_ms, heaviest = measure_import_time(args.top)
+        import_times.append(total_ms)
+
+    first_responses = []
+    warm_latencies = []
+    for _ in range(args.runs):
+        first_response_ms, warm_ms = measure_first_response(args.path, args.timeout, args.warm_requests)
+        first_responses.append(first_response_ms)
+        warm_latencies.append(warm_ms)
+
+    print(f"import main: median {statistics.median(import_times):.1f} ms "
+          f"(min {min(import_times):.1f}, max {max(import_times):.1f})")
+    print(f"time-to-first-response {args.path}: median {statistics.median(first_responses):.1f} ms "
+          f"(min {min(first_responses):.1f}, max {max(first_responses):.1f})")
+    print(f"warm request {args.path}: median {statistics.median(warm_latencies):.2f} ms")
+    print("Самые тяжелые модули (собственное время, последний запуск):")
+    for self_us, name in heaviest:
+        print(f"  {self_us / 1000:8.1f} ms  {name}")
+
+
+if __name__ == "__main__":
+    main()
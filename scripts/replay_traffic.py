@@ -0,0 +1,253 @@
+"""
+Воспроизведение захваченного потока запросов к API.
+
+Читает файл NDJSON, записанный middleware захвата (переменная окружения
+INCIDENTS_CAPTURE_FILE), и отправляет запросы на указанный сервер в исходном
+порядке. Скорость воспроизведения:
+    --speed 1   исходные интервалы между запросами;
+    --speed 2   интервалы сокращены вдвое (0.5 - растянуты вдвое);
+    --speed 0   максимальная скорость, ограниченная только --concurrency.
+
+По окончании выводит пропускную способность, перцентили задержки (в целом
+и по эндпоинтам) в сравнении с задержкой при захвате, а также расхождения
+кодов ответа с записанными.
+
+Идентификаторы инцидентов в путях воспроизводятся как есть, поэтому для
+совпадения кодов ответа сервер должен стартовать с тем же состоянием БД,
+что и при захвате (например, с пустой БД), а лимиты на создание инцидентов
+должны допускать ускоренное воспроизведение.
+
+Пример запуска из корня репозитория:
+    python scripts/replay_traffic.py traffic.ndjson --speed 0 --concurrency 20
+"""
+import argparse
+import http.client
+import json
+import re
+import sys
+import threading
+import time
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+
+PERCENTILES = (50, 90, 99)
+
+
+def load_requests(path: str, limit: int):
+    """
+    Загружает захваченные запросы в порядке времени их поступления.
+
+    Returns:
+        list: Записи с добавленным смещением "offset" (с) от первого запроса
+    """
+    entries = []
+    with open(path, encoding="utf-8") as file:
+        for line in file:
+            line = line.strip()
+            if line:
+                entries.append(json.loads(line))
+    # Сортировка устойчива: запросы с одинаковым временем сохраняют порядок в файле
+    entries.sort(key=lambda entry: entry["ts"])
+    if limit:
+        entries = entries[:limit]
+    if entries:
+        first_ts = entries[0]["ts"]
+        for entry in entries:
+            entry["offset"] = entry["ts"] - first_ts
+    return entries
+
+
+def endpoint_of(entry: dict) -> str:
+    """Группирует запросы по эндпоинту, заменяя идентификаторы в пути на {id}."""
+    return f"{entry['method']} {re.sub(r'/[0-9]+(?=/|$)', '/{id}', entry['path'])}"
+
+
+def percentile(values, percent: float) -> float:
+    """Перцентиль методом ближайшего ранга."""
+    ordered = sorted(values)
+    rank = max(1, -(-len(ordered) * percent // 100))
+    return ordered[int(rank) - 1]
+
+
+# Ошибки, означающие, что сервер уже закрыл переиспользуемое keep-alive соединение
+_STALE_CONNECTION_ERRORS = (http.client.RemoteDisconnected, BrokenPipeError, ConnectionResetError)
+
+
+class Replayer:
+    def __init__(self, base_url: str, timeout: float, idle_timeout: float = 4.0):
+        """
+        Args:
+            base_url: Адрес сервера, например http://127.0.0.1:8000
+            timeout: Таймаут одного запроса, с
+            idle_timeout: Простой, после которого соединение не переиспользуется, с.
+                Должен быть меньше таймаута keep-alive сервера (у uvicorn 5 с)
+        """
+        url = urlsplit(base_url)
+        self.connection_class = (
+            http.client.HTTPSConnection if url.scheme == "https" else http.client.HTTPConnection
+        )
+        self.netloc = url.netloc
+        self.prefix = url.path.rstrip("/")
+        self.timeout = timeout
+        self.idle_timeout = idle_timeout
+        # Каждый поток держит свое keep-alive соединение, чтобы не замерять установку TCP
+        self._local = threading.local()
+
+    def _connection(self):
+        """
+        Возвращает соединение текущего потока.
+
+        Returns:
+            tuple: (соединение, True, если оно уже использовалось)
+        """
+        connection = getattr(self._local, "connection", None)
+        idle = time.perf_counter() - getattr(self._local, "last_used", 0.0)
+        if connection is not None and idle > self.idle_timeout:
+            # При редких запросах сервер закрывает простаивающее соединение сам
+            self._drop_connection()
+            connection = None
+        if connection is None:
+            connection = self._local.connection = self.connection_class(self.netloc, timeout=self.timeout)
+            return connection, False
+        return connection, True
+
+    def _drop_connection(self) -> None:
+        connection = getattr(self._local, "connection", None)
+        self._local.connection = None
+        if connection is not None:
+            connection.close()
+
+    def send(self, entry: dict):
+        """
+        Отправляет один запрос.
+
+        Если переиспользуемое соединение оказалось закрыто сервером,
+        запрос один раз повторяется через новое соединение.
+
+        Returns:
+            tuple: (код ответа или None при ошибке соединения, задержка в мс, описание ошибки)
+        """
+        path = self.prefix + entry["path"] + (f"?{entry['query']}" if entry.get("query") else "")
+        body = entry.get("body")
+        payload = body.encode() if body is not None else None
+        headers = {"Content-Type": "application/json"} if body is not None else {}
+        while True:
+            started = time.perf_counter()
+            reused = False
+            try:
+                connection, reused = self._connection()
+                connection.request(entry["method"], path, body=payload, headers=headers)
+                response = connection.getresponse()
+                response.read()
+                self._local.last_used = time.perf_counter()
+                return response.status, (time.perf_counter() - started) * 1000, None
+            except (OSError, http.client.HTTPException) as error:
+                self._drop_connection()
+                # Запрос через закрытое сервером соединение не дошел до приложения:
+                # это не ошибка сервера, поэтому он повторяется через новое соединение
+                if reused and isinstance(error, _STALE_CONNECTION_ERRORS):
+                    continue
+                return None, (time.perf_counter() - started) * 1000, type(error).__name__
+
+
+def replay(entries, replayer: Replayer, speed: float, concurrency: int):
+    """
+    Воспроизводит запросы по расписанию исходного потока.
+
+    Returns:
+        tuple: (результаты в порядке запросов, общее время в с, максимальное отставание от расписания в мс)
+    """
+    results = [None] * len(entries)
+    max_lag = 0.0
+
+    def run(index: int, scheduled_at: float):
+        nonlocal max_lag
+        # Отставание: запрос ждал свободного потока дольше, чем предполагало расписание
+        max_lag = max(max_lag, time.perf_counter() - scheduled_at)
+        results[index] = replayer.send(entries[index])
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        for index, entry in enumerate(entries):
+            scheduled_at = started + (entry["offset"] / speed if speed > 0 else 0.0)
+            delay = scheduled_at - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            executor.submit(run, index, scheduled_at)
+    return results, time.perf_counter() - started, max_lag * 1000
+
+
+def report(entries, results, elapsed: float, max_lag_ms: float, top_diffs: int) -> int:
+    """
+    Печатает отчет о воспроизведении.
+
+    Returns:
+        int: Количество запросов с расхождением кода ответа
+    """
+    latencies = [latency for _, latency, _ in results]
+    print(f"requests: {len(entries)} in {elapsed:.2f} s, throughput {len(entries) / elapsed:.1f} req/s, "
+          f"max schedule lag {max_lag_ms:.1f} ms")
+    print("latency, ms: " + ", ".join(f"p{p} {percentile(latencies, p):.2f}" for p in PERCENTILES)
+          + f", max {max(latencies):.2f}")
+
+    by_endpoint = defaultdict(lambda: ([], []))
+    for entry, (_, latency, _) in zip(entries, results):
+        replayed, captured = by_endpoint[endpoint_of(entry)]
+        replayed.append(latency)
+        if entry.get("duration_ms") is not None:
+            captured.append(entry["duration_ms"])
+
+    # Задержка при захвате - время обработки в приложении, без сети,
+    # поэтому сравнивать ее с воспроизведением корректно только по порядку величины
+    print(f"{'endpoint':40} {'count':>6} " + " ".join(f"{f'p{p}':>9}" for p in PERCENTILES)
+          + f" {'captured p50':>13} {'captured p99':>13}")
+    for endpoint, (replayed, captured) in sorted(by_endpoint.items()):
+        captured_p50 = f"{percentile(captured, 50):13.2f}" if captured else f"{'-':>13}"
+        captured_p99 = f"{percentile(captured, 99):13.2f}" if captured else f"{'-':>13}"
+        print(f"{endpoint:40} {len(replayed):6} "
+              + " ".join(f"{percentile(replayed, p):9.2f}" for p in PERCENTILES)
+              + f" {captured_p50} {captured_p99}")
+
+    diffs = Counter()
+    for entry, (status, _, error) in zip(entries, results):
+        actual = status if status is not None else error
+        if actual != entry.get("status"):
+            diffs[(endpoint_of(entry), entry.get("status"), actual)] += 1
+    mismatched = sum(diffs.values())
+    print(f"status mismatches: {mismatched} of {len(entries)}")
+    for (endpoint, expected, actual), count in diffs.most_common(top_diffs):
+        print(f"  {count:6}  {endpoint}: captured {expected} -> replayed {actual}")
+    return mismatched
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Воспроизведение захваченного потока запросов")
+    parser.add_argument("file", help="Файл NDJSON, записанный при INCIDENTS_CAPTURE_FILE")
+    parser.add_argument("--base-url", default="http://127.0.0.1:8000", help="Адрес сервера")
+    parser.add_argument("--speed", type=float, default=1.0,
+                        help="Множитель скорости: 1 - исходная, 2 - вдвое быстрее, 0 - максимальная")
+    parser.add_argument("--concurrency", type=int, default=10, help="Максимум одновременных запросов")
+    parser.add_argument("--limit", type=int, default=0, help="Воспроизвести только первые N запросов")
+    parser.add_argument("--timeout", type=float, default=10.0, help="Таймаут одного запроса, с")
+    parser.add_argument("--idle-timeout", type=float, default=4.0,
+                        help="Простой, после которого keep-alive соединение открывается заново, с")
+    parser.add_argument("--top-diffs", type=int, default=10, help="Сколько групп расхождений показать")
+    parser.add_argument("--fail-on-diff", action="store_true",
+                        help="Завершиться с кодом 1 при расхождении кодов ответа")
+    args = parser.parse_args()
+
+    entries = load_requests(args.file, args.limit)
+    if not entries:
+        print("Файл не содержит запросов")
+        return
+    results, elapsed, max_lag_ms = replay(
+        entries, Replayer(args.base_url, args.timeout, args.idle_timeout), args.speed, args.concurrency
+    )
+    mismatched = report(entries, results, elapsed, max_lag_ms, args.top_diffs)
+    if args.fail_on_diff and mismatched:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,165 @@
+import os
+
+"""Настройки приложения, считываемые из переменных окружения"""
+
+
+def _env_bool(name: str, default: bool) -> bool:
+    """
+    Считывает логический флаг из переменной окружения.
+
+    Args:
+        name: Имя переменной окружения
+        default: Значение по умолчанию, если переменная не задана
+
+    Returns:
+        bool: Значение флага
+    """
+    value = os.getenv(name)
+    if value is None:
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
+def _env_float(name: str, default: float) -> float:
+    """
+    Считывает число с плавающей точкой из переменной окружения.
+
+    Args:
+        name: Имя переменной окружения
+        default: Значение по умолчанию, если переменная не задана
+
+    Returns:
+        float: Значение переменной
+    """
+    value = os.getenv(name)
+    return float(value) if value else default
+
+
+def _env_int(name: str, default: int) -> int:
+    """
+    Считывает целое число из переменной окружения.
+
+    Args:
+        name: Имя переменной окружения
+        default: Значение по умолчанию, если переменная не задана
+
+    Returns:
+        int: Значение переменной
+    """
+    value = os.getenv(name)
+    return int(value) if value else default
+
+
+def _env_rate(name: str, default: tuple) -> tuple:
+    """
+    Считывает лимит token bucket в формате "<запросов в секунду>:<burst>".
+
+    Args:
+        name: Имя переменной окружения
+        default: Пара (rate, burst) по умолчанию
+
+    Returns:
+        tuple: Пара (rate, burst)
+
+    Raises:
+        ValueError: Если значение не в формате "<rate>:<burst>", rate <= 0 или burst < 1
+    """
+    value = os.getenv(name)
+    if not value:
+        return default
+    try:
+        rate, burst = value.split(":")
+        rate, burst = float(rate), int(burst)
+    except ValueError:
+        raise ValueError(f"{name}: ожидается формат '<запросов в секунду>:<burst>', получено '{value}'") from None
+    # При нулевой скорости корзина никогда не пополняется, а расчет Retry-After делит на нее
+    if rate <= 0 or burst < 1:
+        raise ValueError(f"{name}: скорость должна быть больше 0, а burst - не меньше 1, получено '{value}'")
+    return rate, burst
+
+
+# Строка подключения к базе данных
+DATABASE_URL = os.getenv("INCIDENTS_DATABASE_URL", "sqlite:///incidents.db")
+
+# Реализация репозитория инцидентов: "sql" (SQLAlchemy) или "memory" (в памяти процесса)
+REPOSITORY_BACKEND = os.getenv("INCIDENTS_REPOSITORY", "sql")
+
+# Каталог журнала и снимков для репозитория в памяти
+MEMORY_DATA_DIR = os.getenv("INCIDENTS_MEMORY_DATA_DIR", "incident_data")
+
+# Количество записей в журнале между снимками и fsync после каждой записи
+MEMORY_SNAPSHOT_EVERY = _env_int("INCIDENTS_MEMORY_SNAPSHOT_EVERY", 10000)
+MEMORY_FSYNC = _env_bool("INCIDENTS_MEMORY_FSYNC", False)
+
+# Размер LRU-кеша инцидентов для поиска по id (0 - кеш отключен). Кеш свой у каждого процесса,
+# поэтому при нескольких процессах изменения статуса из соседних процессов в нем не видны
+INCIDENT_CACHE_SIZE = _env_int("INCIDENTS_CACHE_SIZE", 10000)
+
+# Максимальное количество id в одном запросе GET /incidents/?ids=...
+BATCH_LOOKUP_MAX_IDS = _env_int("INCIDENTS_BATCH_LOOKUP_MAX_IDS", 100)
+
+# Логирование всех SQL-запросов (дорого, включать только для отладки)
+SQL_ECHO = _env_bool("INCIDENTS_SQL_ECHO", False)
+
+# Swagger UI, ReDoc и /openapi.json. В production можно отключить
+DOCS_ENABLED = _env_bool("INCIDENTS_DOCS_ENABLED", True)
+
+# Лимиты на создание инцидентов (rate, burst) для каждого источника
+SOURCE_RATE_LIMITS = {
+    "operator": _env_rate("INCIDENTS_RATE_LIMIT_OPERATOR", (50.0, 100)),
+    "monitoring": _env_rate("INCIDENTS_RATE_LIMIT_MONITORING", (20.0, 40)),
+    "partner": _env_rate("INCIDENTS_RATE_LIMIT_PARTNER", (5.0, 20)),
+}
+
+# Лимит на создание инцидентов (rate, burst) для одного клиента
+CLIENT_RATE_LIMIT = _env_rate("INCIDENTS_RATE_LIMIT_CLIENT", (20.0, 40))
+
+# Общее хранилище лимитов для нескольких процессов (например, redis://localhost:6379/0).
+# Если не задано, лимиты хранятся в памяти процесса
+RATE_LIMIT_REDIS_URL = os.getenv("INCIDENTS_RATE_LIMIT_REDIS_URL")
+
+# Источники, запись от которых отбрасывается первой при перегрузке
+LOW_PRIORITY_SOURCES = frozenset(
+    os.getenv("INCIDENTS_LOW_PRIORITY_SOURCES", "monitoring,partner").split(",")
+)
+
+# Пороги перегрузки: задержка event loop (с) и доля занятых соединений пула БД
+MAX_EVENT_LOOP_LAG = _env_float("INCIDENTS_MAX_EVENT_LOOP_LAG", 0.1)
+MAX_DB_POOL_USAGE = _env_float("INCIDENTS_MAX_DB_POOL_USAGE", 0.9)
+
+# Значение заголовка Retry-After (с) для отброшенных при перегрузке запросов
+SHED_RETRY_AFTER = _env_int("INCIDENTS_SHED_RETRY_AFTER", 1)
+
+# Получатель событий outbox: http(s)://... для HTTP POST или file:<путь> для файла NDJSON.
+# Если не задан, события не записываются в outbox, а диспетчер не запускается
+OUTBOX_SINK = os.getenv("INCIDENTS_OUTBOX_SINK")
+
+# Параметры диспетчера outbox
+OUTBOX_BATCH_SIZE = _env_int("INCIDENTS_OUTBOX_BATCH_SIZE", 100)
+OUTBOX_CONCURRENCY = _env_int("INCIDENTS_OUTBOX_CONCURRENCY", 10)
+OUTBOX_POLL_INTERVAL = _env_float("INCIDENTS_OUTBOX_POLL_INTERVAL", 1.0)
+OUTBOX_MAX_ATTEMPTS = _env_int("INCIDENTS_OUTBOX_MAX_ATTEMPTS", 10)
+# Срок хранения недоставленных событий (попытки исчерпаны) от момента создания, секунды.
+# 0 - хранить, пока их не удалят вручную
+OUTBOX_DEAD_RETENTION = _env_float("INCIDENTS_OUTBOX_DEAD_RETENTION", 7 * 24 * 3600.0)
+
+# Профилирование отдельных запросов: токен для заголовка X-Profile-Request
+# и доля случайно профилируемых запросов. Если оба не заданы, middleware не подключается
+PROFILING_TOKEN = os.getenv("INCIDENTS_PROFILING_TOKEN")
+PROFILING_SAMPLE_RATE = _env_float("INCIDENTS_PROFILING_SAMPLE_RATE", 0.0)
+
+# Каталог профилей speedscope, количество хранимых профилей и период сэмплирования (с)
+PROFILING_DIR = os.getenv("INCIDENTS_PROFILING_DIR", "profiles")
+PROFILING_KEEP = _env_int("INCIDENTS_PROFILING_KEEP", 50)
+PROFILING_INTERVAL = _env_float("INCIDENTS_PROFILING_INTERVAL", 0.001)
+
+# Захват потока запросов в файл NDJSON для воспроизведения (scripts/replay_traffic.py).
+# Если файл не задан, middleware не подключается
+CAPTURE_FILE = os.getenv("INCIDENTS_CAPTURE_FILE")
+
+# Доля захватываемых запросов, маскируемые поля тела и максимальный размер сохраняемого тела (байт)
+CAPTURE_SAMPLE_RATE = _env_float("INCIDENTS_CAPTURE_SAMPLE_RATE", 1.0)
+CAPTURE_REDACT_FIELDS = frozenset(
+    field for field in os.getenv("INCIDENTS_CAPTURE_REDACT_FIELDS", "text").split(",") if field
+)
+CAPTURE_MAX_BODY_SIZE = _env_int("INCIDENTS_CAPTURE_MAX_BODY_SIZE", 65536)
@@ -1,14 +1,21 @@
-from fastapi import APIRouter, Depends, HTTPException, status as fapi_status, Path
-from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status as fapi_status, Path, Query
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Dict, List, Optional
 
+import config
 from services.abstract.incident_interface import IIncidentService
 from services.dto.incident_dto import IncidentDTO
-from infrastructure.dependency_provider import get_incident_service
+from infrastructure.dependency_provider import get_incident_service, get_ingestion_guard
 
 router = APIRouter(prefix="/incidents", tags=["incidents"])
 
+# Наибольший id, который помещается в 64-битную целочисленную колонку БД.
+# Большие значения драйвер БД не может передать в запрос
+MAX_INCIDENT_ID = 2 ** 63 - 1
+
 # Pydantic модели для запросов и ответов
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 
 class IncidentCreateRequest(BaseModel):
     """
@@ -19,18 +26,19 @@ class IncidentCreateRequest(BaseModel):
         status: Статус инцидента (по умолчанию "pending")
         source: Источник инцидента
     """
-    text: str = Field(..., example="Самокат не в сети", description="Текст описания инцидента")
-    status: Optional[str] = Field(default="pending", example="pending", description="Статус инцидента")
-    source: str = Field(..., example="monitoring", description="Источник инцидента")
+    text: str = Field(..., examples=["Самокат не в сети"], description="Текст описания инцидента")
+    status: Optional[str] = Field(default="pending", examples=["pending"], description="Статус инцидента")
+    source: str = Field(..., examples=["monitoring"], description="Источник инцидента")
 
-    class Config:
-        schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "text": "Самокат не в сети",
                 "status": "pending",
                 "source": "monitoring"
             }
         }
+    )
 
 class IncidentUpdateStatusRequest(BaseModel):
     """
@@ -39,7 +47,7 @@ class IncidentUpdateStatusRequest(BaseModel):
     Attributes:
         new_status: Новый статус инцидента
     """
-    new_status: str = Field(..., example="in progress", description="Новый статус инцидента")
+    new_status: str = Field(..., examples=["in progress"], description="Новый статус инцидента")
 
 class IncidentResponse(BaseModel):
     """
@@ -52,15 +60,15 @@ class IncidentResponse(BaseModel):
         source: Источник инцидента
         created_at: Дата и время создания инцидента
     """
-    id: Optional[int] = Field(None, example=1, description="Уникальный идентификатор инцидента")
-    text: str = Field(..., example="Самокат не в сети", description="Текст описания инцидента")
-    status: str = Field(..., example="pending", description="Текущий статус инцидента")
-    source: str = Field(..., example="monitoring", description="Источник инцидента")
-    created_at: Optional[str] = Field(None, example="2023-10-01T12:00:00Z", description="Дата и время создания инцидента")
-
-    class Config:
-        from_attributes = True
-        schema_extra = {
+    id: Optional[int] = Field(None, examples=[1], description="Уникальный идентификатор инцидента")
+    text: str = Field(..., examples=["Самокат не в сети"], description="Текст описания инцидента")
+    status: str = Field(..., examples=["pending"], description="Текущий статус инцидента")
+    source: str = Field(..., examples=["monitoring"], description="Источник инцидента")
+    created_at: Optional[str] = Field(None, examples=["2023-10-01T12:00:00Z"], description="Дата и время создания инцидента")
+
+    model_config = ConfigDict(
+        from_attributes=True,
+        json_schema_extra={
             "example": {
                 "id": 1,
                 "text": "Самокат не в сети",
@@ -69,11 +77,62 @@ class IncidentResponse(BaseModel):
                 "created_at": "2023-10-01T12:00:00Z"
             }
         }
+    )
+
+class StatusDurationResponse(BaseModel):
+    """
+    Модель статистики времени пребывания инцидентов в статусе.
+    
+    Attributes:
+        status: Статус инцидента
+        count: Количество завершенных интервалов в статусе
+        avg_seconds: Среднее время в статусе, секунды
+        percentiles: Перцентили времени в статусе, секунды (ключи p50, p90, p99)
+    """
+    status: str = Field(..., examples=["pending"], description="Статус инцидента")
+    count: int = Field(..., examples=[42], description="Количество завершенных интервалов в статусе")
+    avg_seconds: float = Field(..., examples=[310.5], description="Среднее время в статусе, секунды")
+    percentiles: Dict[str, Optional[float]] = Field(..., examples=[{"p50": 120.0, "p90": 900.0, "p99": 3600.0}], description="Перцентили времени в статусе, секунды")
+
+class SourceAnalyticsResponse(BaseModel):
+    """
+    Модель ответа с аналитикой статусов для источника инцидентов.
+    
+    Attributes:
+        source: Источник инцидентов
+        resolved_count: Количество решенных инцидентов
+        mttr_seconds: Среднее время решения (MTTR), секунды
+        resolution_percentiles: Перцентили времени решения, секунды
+        time_in_status: Статистика времени пребывания в каждом статусе
+    """
+    source: str = Field(..., examples=["monitoring"], description="Источник инцидентов")
+    resolved_count: int = Field(..., examples=[40], description="Количество решенных инцидентов")
+    mttr_seconds: Optional[float] = Field(None, examples=[1800.0], description="Среднее время решения (MTTR), секунды")
+    resolution_percentiles: Dict[str, Optional[float]] = Field(..., examples=[{"p50": 1200.0, "p90": 3600.0, "p99": 7200.0}], description="Перцентили времени решения, секунды")
+    time_in_status: List[StatusDurationResponse] = Field(..., description="Статистика времени пребывания в каждом статусе")
+
+
+async def admit_ingestion(request: Request, incident_data: IncidentCreateRequest) -> None:
+    """
+    Зависимость, пропускающая запрос на создание инцидента через ограничитель частоты
+    и контроллер допуска.
+
+    Подключается к маршруту через dependencies и поэтому выполняется раньше зависимости
+    сервиса: отклоненный запрос (429/503) не занимает поток из общего пула и не открывает
+    сессию БД. Сама зависимость асинхронная и получает ограничитель напрямую, чтобы
+    не переходить в пул потоков и при его полной загрузке.
+
+    Args:
+        request: Входящий HTTP-запрос
+        incident_data: Данные создаваемого инцидента
+    """
+    await get_ingestion_guard().admit(request, incident_data.source)
 
 
 @router.post(
     "/", 
     status_code=fapi_status.HTTP_201_CREATED,
+    dependencies=[Depends(admit_ingestion)],
     summary="Создать новый инцидент",
     response_description="Сообщение о успешном создании инцидента",
     responses={
@@ -93,6 +152,14 @@ class IncidentResponse(BaseModel):
                 }
             }
         },
+        429: {
+            "description": "Превышен лимит запросов для клиента или источника",
+            "content": {
+                "application/json": {
+                    "example": {"detail": "Превышен лимит запросов для источника 'partner'"}
+                }
+            }
+        },
         500: {
             "description": "Внутренняя ошибка сервера",
             "content": {
@@ -100,6 +167,14 @@ class IncidentResponse(BaseModel):
                     "example": {"detail": "Ошибка при создании инцидента: ..."}
                 }
             }
+        },
+        503: {
+            "description": "Сервис перегружен, низкоприоритетные записи временно отклоняются",
+            "content": {
+                "application/json": {
+                    "example": {"detail": "Сервис перегружен (задержка event loop 250 мс), повторите запрос позже"}
+                }
+            }
         }
     }
 )
@@ -112,6 +187,10 @@ async def create_incident(
     
     Этот endpoint позволяет добавить новый инцидент в базу данных с указанием
     текста описания, статуса и источника инцидента.
+
+    Запросы ограничены по частоте для каждого клиента и источника (429),
+    а при перегрузке записи от низкоприоритетных источников отклоняются (503).
+    Оба ответа содержат заголовок Retry-After.
     """
     try:
         # Создаем DTO из запроса
@@ -178,8 +257,11 @@ async def create_incident(
                 }
             }
         },
+        304: {
+            "description": "Список не изменился с момента, указанного в If-None-Match или If-Modified-Since"
+        },
         400: {
-            "description": "Неверный статус для фильтрации",
+            "description": "Неверный статус для фильтрации или список id",
             "content": {
                 "application/json": {
                     "example": {"detail": "Недопустимый статус: 'invalid_status'"}
@@ -197,7 +279,10 @@ async def create_incident(
     }
 )
 async def get_incidents(
+    request: Request,
+    response: Response,
     status: Optional[str] = None,
+    ids: Optional[str] = Query(None, description="Идентификаторы инцидентов через запятую", examples=["1,2,3"]),
     service: IIncidentService = Depends(get_incident_service)
 ):
     """
@@ -205,26 +290,49 @@ async def get_incidents(
     
     Если параметр status не указан, возвращаются инциденты со статусом "pending".
     Допустимые значения статуса: "pending", "in progress", "solved".
+
+    Ответ содержит заголовки ETag и Last-Modified. Если список не изменился,
+    на запрос с If-None-Match или If-Modified-Since возвращается 304 без тела,
+    а сами инциденты не читаются из БД.
+
+    С параметром ids (например, ?ids=1,2,3) вместо списка по статусу возвращаются
+    инциденты с указанными id в порядке запроса; ненайденные id пропускаются.
+    Параметры status и ids взаимоисключающие.
     """
+    if ids is not None:
+        if status is not None:
+            raise HTTPException(
+                status_code=fapi_status.HTTP_400_BAD_REQUEST,
+                detail="Параметры status и ids нельзя передавать одновременно"
+            )
+        incident_ids = _parse_ids(ids)
+        try:
+            return [_incident_response(incident) for incident in service.get_incidents_by_ids(incident_ids)]
+        except Exception as e:
+            raise HTTPException(
+                status_code=fapi_status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"Ошибка при получении инцидентов: {str(e)}"
+            )
+
     try:
         if status is None:
             # Если статус не указан, можно вернуть все инциденты
             # Для простоты возвращаем pending инциденты
             status = "pending"
+
+        # Версия читается до инцидентов: при гонке с записью ETag окажется
+        # старше тела, и клиент просто получит список заново при следующем опросе
+        version, updated_at = service.get_incidents_version(status)
+        cache_headers = _list_cache_headers(status, version, updated_at)
+        if _is_not_modified(request, cache_headers["ETag"], updated_at):
+            return Response(status_code=fapi_status.HTTP_304_NOT_MODIFIED, headers=cache_headers)
         
         incidents = service.get_incidents(status)
         
         # Преобразуем DTO в Pydantic модели для ответа
-        incident_responses = []
-        for incident in incidents:
-            incident_responses.append(IncidentResponse(
-                id=incident.id,
-                text=incident.text,
-                status=incident.status,
-                source=incident.source,
-                created_at=incident.created_at.isoformat() if incident.created_at else None
-            ))
-            
+        incident_responses = [_incident_response(incident) for incident in incidents]
+
+        response.headers.update(cache_headers)
         return incident_responses
         
     except ValueError as e:
@@ -239,6 +347,217 @@ async def get_incidents(
         )
 
 
+def _incident_response(incident: IncidentDTO) -> IncidentResponse:
+    """Преобразует DTO инцидента в модель ответа"""
+    return IncidentResponse(
+        id=incident.id,
+        text=incident.text,
+        status=incident.status,
+        source=incident.source,
+        created_at=incident.created_at.isoformat() if incident.created_at else None
+    )
+
+
+def _parse_ids(ids: str) -> List[int]:
+    """
+    Разбирает параметр ids вида "1,2,3".
+
+    Args:
+        ids: Идентификаторы инцидентов через запятую
+
+    Returns:
+        List[int]: Идентификаторы в порядке запроса
+
+    Raises:
+        HTTPException: 400, если список пуст, содержит не целые положительные
+            числа или числа больше MAX_INCIDENT_ID, либо длиннее BATCH_LOOKUP_MAX_IDS
+    """
+    try:
+        incident_ids = [int(item) for item in ids.split(",") if item.strip()]
+    except ValueError:
+        incident_ids = []
+    if not incident_ids or any(not 1 <= id <= MAX_INCIDENT_ID for id in incident_ids):
+        raise HTTPException(
+            status_code=fapi_status.HTTP_400_BAD_REQUEST,
+            detail=f"Некорректный список id: '{ids}'"
+        )
+    if len(incident_ids) > config.BATCH_LOOKUP_MAX_IDS:
+        raise HTTPException(
+            status_code=fapi_status.HTTP_400_BAD_REQUEST,
+            detail=f"Можно запросить не более {config.BATCH_LOOKUP_MAX_IDS} инцидентов за раз"
+        )
+    return incident_ids
+
+
+def _list_cache_headers(status: str, version: int, updated_at: Optional[datetime]) -> Dict[str, str]:
+    """
+    Формирует заголовки кеширования для списка инцидентов.
+
+    Args:
+        status: Статус инцидентов в списке
+        version: Версия списка
+        updated_at: Время последнего изменения списка (UTC)
+
+    Returns:
+        Dict[str, str]: Заголовки ETag, Cache-Control и, если известно, Last-Modified
+    """
+    headers = {
+        # Пробелы недопустимы в ETag, поэтому "in progress" -> "in-progress"
+        "ETag": f'"{status.replace(" ", "-")}-{version}"',
+        # Клиент может хранить ответ, но обязан перепроверять его при каждом опросе
+        "Cache-Control": "no-cache"
+    }
+    if updated_at is not None:
+        headers["Last-Modified"] = format_datetime(_as_utc(updated_at), usegmt=True)
+    return headers
+
+
+def _is_not_modified(request: Request, etag: str, updated_at: Optional[datetime]) -> bool:
+    """
+    Проверяет условные заголовки запроса (RFC 9110, раздел 13).
+
+    If-None-Match имеет приоритет над If-Modified-Since.
+
+    Args:
+        request: Входящий HTTP-запрос
+        etag: Текущий ETag списка
+        updated_at: Время последнего изменения списка (UTC)
+
+    Returns:
+        bool: True, если можно ответить 304 Not Modified
+    """
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        if if_none_match.strip() == "*":
+            return True
+        # Для GET используется слабое сравнение: префикс W/ игнорируется
+        candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+        return etag in candidates
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since is None or updated_at is None:
+        return False
+    try:
+        since = parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
+    if since.tzinfo is None:
+        since = since.replace(tzinfo=timezone.utc)
+    # Last-Modified передается с точностью до секунды
+    return _as_utc(updated_at).replace(microsecond=0) <= since
+
+
+def _as_utc(moment: datetime) -> datetime:
+    """Добавляет часовой пояс UTC к времени, прочитанному из БД без него"""
+    return moment if moment.tzinfo is not None else moment.replace(tzinfo=timezone.utc)
+
+
+@router.get(
+    "/analytics/status-times",
+    response_model=List[SourceAnalyticsResponse],
+    summary="Получить аналитику времени решения и пребывания в статусах",
+    response_description="MTTR и перцентили времени в статусах по источникам",
+    responses={
+        500: {
+            "description": "Внутренняя ошибка сервера",
+            "content": {
+                "application/json": {
+                    "example": {"detail": "Ошибка при расчете аналитики: ..."}
+                }
+            }
+        }
+    }
+)
+async def get_status_analytics(
+    service: IIncidentService = Depends(get_incident_service)
+):
+    """
+    Возвращает аналитику по журналу смены статусов для каждого источника.
+    
+    MTTR - среднее время от создания инцидента до первого перехода в статус "solved".
+    Время в статусе считается по завершенным интервалам между переходами.
+    Все агрегаты рассчитываются в БД.
+    """
+    try:
+        analytics = service.get_status_analytics()
+
+        return [
+            SourceAnalyticsResponse(
+                source=item.source,
+                resolved_count=item.resolved_count,
+                mttr_seconds=item.mttr_seconds,
+                resolution_percentiles={f"p{p}": value for p, value in item.resolution_percentiles.items()},
+                time_in_status=[
+                    StatusDurationResponse(
+                        status=duration.status,
+                        count=duration.count,
+                        avg_seconds=duration.avg_seconds,
+                        percentiles={f"p{p}": value for p, value in duration.percentiles.items()}
+                    )
+                    for duration in item.time_in_status
+                ]
+            )
+            for item in analytics
+        ]
+
+    except Exception as e:
+        raise HTTPException(
+            status_code=fapi_status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Ошибка при расчете аналитики: {str(e)}"
+        )
+
+
+# Объявлен после /analytics/status-times, чтобы этот путь не разбирался как id инцидента
+@router.get(
+    "/{incident_id}",
+    response_model=IncidentResponse,
+    summary="Получить инцидент по ID",
+    response_description="Данные инцидента",
+    responses={
+        404: {
+            "description": "Инцидент не найден",
+            "content": {
+                "application/json": {
+                    "example": {"detail": "Инцидент с ID 999 не найден"}
+                }
+            }
+        },
+        500: {
+            "description": "Внутренняя ошибка сервера",
+            "content": {
+                "application/json": {
+                    "example": {"detail": "Ошибка при получении инцидента: ..."}
+                }
+            }
+        }
+    }
+)
+async def get_incident(
+    incident_id: int = Path(..., ge=1, le=MAX_INCIDENT_ID, description="ID инцидента", examples=[1]),
+    service: IIncidentService = Depends(get_incident_service)
+):
+    """
+    Возвращает инцидент по его идентификатору.
+
+    Инциденты кешируются по id, изменения статуса записываются в кеш сразу,
+    поэтому повторные запросы одного инцидента не обращаются к БД.
+    """
+    try:
+        incident = service.get_incident(incident_id)
+    except Exception as e:
+        raise HTTPException(
+            status_code=fapi_status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Ошибка при получении инцидента: {str(e)}"
+        )
+
+    if incident is None:
+        raise HTTPException(
+            status_code=fapi_status.HTTP_404_NOT_FOUND,
+            detail=f"Инцидент с ID {incident_id} не найден"
+        )
+    return _incident_response(incident)
+
+
 @router.patch(
     "/{incident_id}/status", 
     status_code=fapi_status.HTTP_200_OK,
@@ -280,7 +599,7 @@ async def get_incidents(
     }
 )
 async def update_incident_status(
-    incident_id: int = Path(..., description="ID инцидента для обновления", example=1),
+    incident_id: int = Path(..., description="ID инцидента для обновления", examples=[1]),
     status_data: IncidentUpdateStatusRequest = ...,
     service: IIncidentService = Depends(get_incident_service)
 ):
@@ -0,0 +1,87 @@
+import math
+from typing import Dict, FrozenSet, Optional, Tuple
+
+from fastapi import HTTPException, Request, status as fapi_status
+
+from infrastructure.abstract.rate_limit_backend_interface import IRateLimitBackend
+from infrastructure.admission_controller import AdmissionController
+
+class IngestionGuard:
+    def __init__(
+        self,
+        backend: IRateLimitBackend,
+        admission: AdmissionController,
+        source_limits: Dict[str, Tuple[float, int]],
+        client_limit: Tuple[float, int],
+        low_priority_sources: FrozenSet[str],
+        shed_retry_after: int
+    ):
+        """
+        Инициализирует защиту пути приема инцидентов (POST /incidents/).
+
+        Args:
+            backend: Хранилище корзин token bucket
+            admission: Контроллер допуска при перегрузке
+            source_limits: Лимиты (rate, burst) для каждого источника
+            client_limit: Лимит (rate, burst) для одного клиента
+            low_priority_sources: Источники, отбрасываемые при перегрузке
+            shed_retry_after: Retry-After в секундах для отброшенных запросов
+        """
+        self.backend = backend
+        self.admission = admission
+        self.source_limits = source_limits
+        self.client_limit = client_limit
+        self.low_priority_sources = low_priority_sources
+        self.shed_retry_after = shed_retry_after
+
+    async def admit(self, request: Request, source: str) -> None:
+        """
+        Пропускает запрос на создание инцидента или отклоняет его.
+
+        Сначала отбрасывает низкоприоритетные записи при перегрузке (503),
+        затем проверяет лимиты клиента и источника (429).
+
+        Args:
+            request: Входящий HTTP-запрос
+            source: Источник создаваемого инцидента
+
+        Raises:
+            HTTPException: 503 при перегрузке или 429 при превышении лимита
+        """
+        source = str(source).lower().strip()
+
+        if source in self.low_priority_sources:
+            reason = self.admission.overload_reason()
+            if reason is not None:
+                raise HTTPException(
+                    status_code=fapi_status.HTTP_503_SERVICE_UNAVAILABLE,
+                    detail=f"Сервис перегружен ({reason}), повторите запрос позже",
+                    headers={"Retry-After": str(self.shed_retry_after)}
+                )
+
+        client = request.client.host if request.client else "unknown"
+        wait = await self.backend.acquire(f"client:{client}", *self.client_limit)
+        if wait > 0:
+            self._reject(wait, f"клиента {client}")
+
+        # Недопустимый источник не тарифицируется: запрос все равно
+        # будет отклонен валидацией с кодом 400
+        source_limit: Optional[Tuple[float, int]] = self.source_limits.get(source)
+        if source_limit is not None:
+            wait = await self.backend.acquire(f"source:{source}", *source_limit)
+            if wait > 0:
+                self._reject(wait, f"источника '{source}'")
+
+    def _reject(self, wait: float, subject: str) -> None:
+        """
+        Отклоняет запрос с кодом 429 и заголовком Retry-After.
+
+        Args:
+            wait: Время до появления токена в секундах
+            subject: Описание ограниченного субъекта для сообщения об ошибке
+        """
+        raise HTTPException(
+            status_code=fapi_status.HTTP_429_TOO_MANY_REQUESTS,
+            detail=f"Превышен лимит запросов для {subject}",
+            headers={"Retry-After": str(max(1, math.ceil(wait)))}
+        )
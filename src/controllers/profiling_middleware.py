@@ -0,0 +1,87 @@
+import asyncio
+import hmac
+import random
+import re
+import threading
+import uuid
+from datetime import datetime
+from typing import Optional
+
+from fastapi import Request
+
+from infrastructure.request_profiler import ProfileStore, SamplingProfiler
+
+class ProfilingMiddleware:
+    def __init__(
+        self,
+        store: ProfileStore,
+        admin_token: Optional[str],
+        sample_rate: float,
+        interval: float
+    ):
+        """
+        Инициализирует HTTP middleware для профилирования отдельных запросов.
+
+        Запрос профилируется, если в нем передан заголовок X-Profile-Request
+        с административным токеном, либо он попал в случайную выборку
+        с вероятностью sample_rate. Одновременно профилируется не больше
+        одного запроса, остальные обрабатываются без профилировщика.
+
+        Профиль сохраняется в формате speedscope, а в ответ добавляются
+        заголовки X-Profile-Id (имя файла) и Server-Timing (время по слоям).
+
+        Args:
+            store: Кольцевое хранилище профилей
+            admin_token: Токен для заголовка X-Profile-Request; None - профилирование по заголовку отключено
+            sample_rate: Доля случайно профилируемых запросов (0..1)
+            interval: Период сэмплирования в секундах
+        """
+        self.store = store
+        self.admin_token = admin_token
+        self.sample_rate = sample_rate
+        self.interval = interval
+        self._busy = False
+
+    async def __call__(self, request: Request, call_next):
+        if self._busy or not self._should_profile(request):
+            return await call_next(request)
+
+        self._busy = True
+        profiler = SamplingProfiler(threading.get_ident(), interval=self.interval)
+        profiler.start()
+        try:
+            response = await call_next(request)
+        finally:
+            profiler.stop()
+            self._busy = False
+
+        name = f"{request.method} {request.url.path}"
+        # Время с микросекундами в начале имени задает хронологический порядок файлов в кольце
+        profile_id = "{}-{}-{}".format(
+            datetime.now().strftime("%Y%m%dT%H%M%S%f"),
+            re.sub(r"[^A-Za-z0-9]+", "_", name).strip("_"),
+            uuid.uuid4().hex[:8]
+        )
+        filename = await asyncio.to_thread(self.store.save, profile_id, profiler.to_speedscope(name))
+
+        response.headers["X-Profile-Id"] = filename
+        response.headers["Server-Timing"] = ", ".join(
+            f"{layer};dur={seconds * 1000:.2f}"
+            for layer, seconds in sorted(profiler.layer_totals().items())
+        )
+        return response
+
+    def _should_profile(self, request: Request) -> bool:
+        """
+        Проверяет, нужно ли профилировать запрос.
+
+        Args:
+            request: Входящий HTTP-запрос
+
+        Returns:
+            bool: True для запроса с верным административным токеном или попавшего в выборку
+        """
+        token = request.headers.get("x-profile-request")
+        if token is not None and self.admin_token:
+            return hmac.compare_digest(token.encode(), self.admin_token.encode())
+        return self.sample_rate > 0 and random.random() < self.sample_rate
@@ -0,0 +1,87 @@
+import json
+import random
+import time
+from typing import FrozenSet, Optional
+
+from fastapi import Request
+
+from infrastructure.traffic_recorder import TrafficRecorder
+
+class TrafficCaptureMiddleware:
+    def __init__(
+        self,
+        recorder: TrafficRecorder,
+        redact_fields: FrozenSet[str],
+        sample_rate: float,
+        max_body_size: int
+    ):
+        """
+        Инициализирует HTTP middleware для захвата потока запросов.
+
+        Для каждого захваченного запроса сохраняются метод, путь, строка запроса,
+        очищенное тело, время начала, длительность обработки и код ответа.
+        Заголовки и адрес клиента не сохраняются. В теле JSON значения полей
+        из redact_fields заменяются строкой той же длины, чтобы воспроизведение
+        сохраняло размер запросов; тела не в формате JSON не сохраняются.
+
+        Args:
+            recorder: Запись захваченных запросов в файл NDJSON
+            redact_fields: Поля тела JSON, значения которых маскируются
+            sample_rate: Доля захватываемых запросов (0..1)
+            max_body_size: Максимальный размер сохраняемого тела в байтах
+        """
+        self.recorder = recorder
+        self.redact_fields = redact_fields
+        self.sample_rate = sample_rate
+        self.max_body_size = max_body_size
+
+    async def __call__(self, request: Request, call_next):
+        if self.sample_rate < 1 and random.random() >= self.sample_rate:
+            return await call_next(request)
+
+        # Тело читается до обработки запроса и остается доступным обработчику
+        body = await request.body()
+        started_at = time.time()
+        started = time.perf_counter()
+        response = await call_next(request)
+        duration = time.perf_counter() - started
+
+        self.recorder.record({
+            "ts": round(started_at, 6),
+            "method": request.method,
+            "path": request.url.path,
+            "query": request.url.query,
+            "body": self._sanitize_body(body),
+            "status": response.status_code,
+            "duration_ms": round(duration * 1000, 3)
+        })
+        return response
+
+    def _sanitize_body(self, body: bytes) -> Optional[str]:
+        """
+        Очищает тело запроса перед сохранением.
+
+        Args:
+            body: Исходное тело запроса
+
+        Returns:
+            Optional[str]: Тело JSON с замаскированными полями или None,
+                если тело пустое, слишком большое или не является JSON
+        """
+        if not body or len(body) > self.max_body_size:
+            return None
+        try:
+            document = json.loads(body)
+        except (UnicodeDecodeError, ValueError):
+            return None
+        return json.dumps(self._redact(document), ensure_ascii=False)
+
+    def _redact(self, value):
+        if isinstance(value, dict):
+            return {
+                key: "*" * len(str(item)) if key in self.redact_fields else self._redact(item)
+                for key, item in value.items()
+            }
+        if isinstance(value, list):
+            return [self._redact(item) for item in value]
+        return value
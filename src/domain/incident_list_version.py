@@ -0,0 +1,51 @@
+from sqlalchemy import String, DateTime, Integer, event
+from sqlalchemy.orm import Mapped, mapped_column
+from datetime import datetime, timezone
+from typing import Optional
+
+from domain.incident import Base
+
+# Статусы, строки версий для которых создаются вместе с таблицей
+LIST_VERSION_STATUSES = ('pending', 'in progress', 'solved')
+
+class IncidentListVersion(Base):
+    """
+    Доменный класс для версии списка инцидентов с определенным статусом.
+
+    Версия увеличивается при каждом изменении состава или содержимого списка
+    и используется для условных GET-запросов (ETag/Last-Modified)
+    без обращения к таблице инцидентов.
+    """
+    __tablename__ = 'incident_list_versions'
+
+    status: Mapped[str] = mapped_column(String(20), primary_key=True)
+    version: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    updated_at: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+
+    def __init__(
+        self,
+        status: str,
+        version: int = 0,
+        updated_at: Optional[datetime] = None
+    ):
+        super().__init__()
+        self.status = status
+        self.version = version
+        self.updated_at = updated_at or datetime.now(timezone.utc)
+
+    def __repr__(self) -> str:
+        return f"IncidentListVersion(status='{self.status}', version={self.version})"
+
+
+@event.listens_for(IncidentListVersion.__table__, "after_create")
+def _seed_list_versions(table, connection, **kwargs) -> None:
+    """
+    Создает строки версий для всех статусов сразу после создания таблицы
+    (Base.metadata.create_all). Тогда увеличение версии всегда сводится к UPDATE,
+    и первые конкурентные записи одного статуса не конфликтуют на вставке строки.
+    """
+    now = datetime.now(timezone.utc)
+    connection.execute(
+        table.insert(),
+        [{"status": status, "version": 0, "updated_at": now} for status in LIST_VERSION_STATUSES]
+    )
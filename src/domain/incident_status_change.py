@@ -0,0 +1,42 @@
+from sqlalchemy import String, DateTime, ForeignKey, Index
+from sqlalchemy.orm import Mapped, mapped_column
+from datetime import datetime, timezone
+from typing import Optional
+
+from domain.incident import Base
+
+class IncidentStatusChange(Base):
+    """
+    Доменный класс для записи журнала смены статусов инцидента.
+
+    Журнал только дополняется: одна запись на каждый переход статуса.
+    """
+    __tablename__ = 'incident_status_changes'
+    __table_args__ = (
+        Index('ix_incident_status_changes_incident_id_changed_at', 'incident_id', 'changed_at'),
+    )
+
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    incident_id: Mapped[int] = mapped_column(ForeignKey('incidents.id'), nullable=False)
+    old_status: Mapped[str] = mapped_column(String(20), nullable=False)
+    new_status: Mapped[str] = mapped_column(String(20), nullable=False)
+    changed_at: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+
+    def __init__(
+        self,
+        incident_id: int,
+        old_status: str,
+        new_status: str,
+        changed_at: Optional[datetime] = None
+    ):
+        super().__init__()
+        self.incident_id = incident_id
+        self.old_status = old_status
+        self.new_status = new_status
+        self.changed_at = changed_at or datetime.now(timezone.utc)
+
+    def __repr__(self) -> str:
+        return (
+            f"IncidentStatusChange(incident_id={self.incident_id}, "
+            f"'{self.old_status}' -> '{self.new_status}')"
+        )
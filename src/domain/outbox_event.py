@@ -0,0 +1,52 @@
+from sqlalchemy import String, DateTime, Text, Integer, Index
+from sqlalchemy.orm import Mapped, mapped_column
+from datetime import datetime, timezone
+from typing import Optional
+
+from domain.incident import Base
+
+class OutboxEvent(Base):
+    """
+    Доменный класс для события во внешние системы (transactional outbox).
+
+    Записывается в одной транзакции с изменением инцидента и удаляется
+    фоновым диспетчером после успешной доставки.
+    """
+    __tablename__ = 'outbox_events'
+    __table_args__ = (
+        Index('ix_outbox_events_next_attempt_at', 'next_attempt_at'),
+        Index('ix_outbox_events_claim_token', 'claim_token'),
+        # id не переиспользуется после удаления доставленных событий
+        # и служит ключом идемпотентности для получателей
+        {'sqlite_autoincrement': True},
+    )
+
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    event_type: Mapped[str] = mapped_column(String(50), nullable=False)
+    incident_id: Mapped[int] = mapped_column(Integer, nullable=False)
+    payload: Mapped[str] = mapped_column(Text, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+    attempts: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    # NULL - доставка прекращена после исчерпания попыток
+    next_attempt_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
+    claim_token: Mapped[Optional[str]] = mapped_column(String(36), nullable=True)
+    claimed_until: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
+    last_error: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+
+    def __init__(
+        self,
+        event_type: str,
+        incident_id: int,
+        payload: str,
+        created_at: Optional[datetime] = None
+    ):
+        super().__init__()
+        self.event_type = event_type
+        self.incident_id = incident_id
+        self.payload = payload
+        self.created_at = created_at or datetime.now(timezone.utc)
+        self.attempts = 0
+        self.next_attempt_at = self.created_at
+
+    def __repr__(self) -> str:
+        return f"OutboxEvent(id={self.id}, event_type='{self.event_type}', incident_id={self.incident_id})"
@@ -1,6 +1,8 @@
 from abc import ABC, abstractmethod
-from typing import List
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 from domain.incident import Incident
+from domain.incident_list_version import IncidentListVersion
 
 class IDatabaseRepository(ABC):
     """
@@ -14,6 +16,9 @@ class IDatabaseRepository(ABC):
     def create_incident(self, incident: Incident) -> None:
         """
         Создает новый инцидент в базе данных.
+
+        В той же транзакции записывает событие incident.created в outbox
+        и увеличивает версию списка инцидентов с его статусом.
         
         Args:
             incident: Доменный объект инцидента
@@ -29,7 +34,51 @@ class IDatabaseRepository(ABC):
             status: Статус инцидентов для фильтрации
             
         Returns:
-            List[Incident]: Список доменных объектов инцидентов
+            List[Incident]: Список доменных объектов инцидентов в порядке id
+        """
+        pass
+
+    @abstractmethod
+    def get_incident_rows_by_status(self, status: str) -> List[Tuple[int, str, str, str, datetime]]:
+        """
+        Возвращает инциденты с указанным статусом кортежами значений.
+
+        Облегченный вариант get_incidents_by_status для чтения: не создает
+        доменные объекты и не отслеживает их изменения.
+        
+        Args:
+            status: Статус инцидентов для фильтрации
+            
+        Returns:
+            List[Tuple[int, str, str, str, datetime]]: Кортежи (id, text, status, source, created_at) в порядке id
+        """
+        pass
+
+    @abstractmethod
+    def get_incident(self, id: int) -> Optional[Incident]:
+        """
+        Возвращает инцидент по его идентификатору.
+        
+        Args:
+            id: Идентификатор инцидента
+            
+        Returns:
+            Optional[Incident]: Доменный объект инцидента или None, если инцидент не найден
+        """
+        pass
+
+    @abstractmethod
+    def get_incidents_by_ids(self, ids: Sequence[int]) -> List[Incident]:
+        """
+        Возвращает инциденты с указанными идентификаторами одним запросом.
+
+        Отсутствующие идентификаторы пропускаются, порядок результата не гарантируется.
+        
+        Args:
+            ids: Идентификаторы инцидентов
+            
+        Returns:
+            List[Incident]: Список найденных доменных объектов инцидентов
         """
         pass
 
@@ -37,12 +86,66 @@ class IDatabaseRepository(ABC):
     def update_incident_status(self, id: int, new_status: str) -> None:
         """
         Обновляет статус инцидента по его идентификатору.
+
+        В той же транзакции добавляет запись в журнал смены статусов
+        и событие incident.status_changed в outbox, а также увеличивает
+        версии списков старого и нового статусов, если статус
+        действительно изменился.
         
         Args:
             id: Идентификатор инцидента
             new_status: Новый статус инцидента
         """
         pass
+
+    @abstractmethod
+    def get_list_version(self, status: str) -> Optional[IncidentListVersion]:
+        """
+        Возвращает версию списка инцидентов с указанным статусом.
+
+        Не обращается к таблице инцидентов.
+        
+        Args:
+            status: Статус инцидентов
+            
+        Returns:
+            Optional[IncidentListVersion]: Версия списка или None,
+                если список еще ни разу не изменялся
+        """
+        pass
+
+    @abstractmethod
+    def get_status_durations(self, percentiles: Sequence[int]) -> List[Dict[str, Any]]:
+        """
+        Возвращает статистику времени пребывания инцидентов в статусах.
+
+        Учитываются только завершенные интервалы: от создания инцидента или
+        предыдущего перехода до следующего перехода статуса.
+        
+        Args:
+            percentiles: Перцентили для расчета (например, 50, 90, 99)
+            
+        Returns:
+            List[Dict[str, Any]]: Строки с ключами source, status, count,
+                avg_seconds и p<N>_seconds для каждого перцентиля
+        """
+        pass
+
+    @abstractmethod
+    def get_resolution_times(self, percentiles: Sequence[int]) -> List[Dict[str, Any]]:
+        """
+        Возвращает статистику времени решения инцидентов по источникам.
+
+        Время решения - от создания инцидента до первого перехода в статус "solved".
+        
+        Args:
+            percentiles: Перцентили для расчета (например, 50, 90, 99)
+            
+        Returns:
+            List[Dict[str, Any]]: Строки с ключами source, resolved_count,
+                mttr_seconds и p<N>_seconds для каждого перцентиля
+        """
+        pass
     
     # Данный интерфейс потом может расширять функционал для других сервисов,
     # если возникнет необходимость в новых таблицах помимо Incident
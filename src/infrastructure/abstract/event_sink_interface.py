@@ -0,0 +1,24 @@
+from abc import ABC, abstractmethod
+from typing import Any, Dict
+
+class IEventSink(ABC):
+    """
+    Интерфейс получателя событий из outbox.
+
+    Реализации доставляют событие во внешнюю систему (уведомления партнеров,
+    пейджинг и т.п.) и выбрасывают исключение, если доставка не удалась.
+    """
+
+    @abstractmethod
+    async def deliver(self, event: Dict[str, Any]) -> None:
+        """
+        Доставляет одно событие.
+
+        Args:
+            event: Событие с ключами id, event_type, incident_id,
+                payload, created_at и attempts
+
+        Raises:
+            Exception: Если событие не доставлено и доставку нужно повторить
+        """
+        pass
@@ -0,0 +1,66 @@
+from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence
+
+class IOutboxRepository(ABC):
+    """
+    Интерфейс репозитория для работы с outbox событий.
+
+    Определяет контракт для фонового диспетчера: захват пачки событий,
+    удаление доставленных, перепланирование неудачных и очистку
+    событий с исчерпанными попытками.
+    """
+
+    @abstractmethod
+    def claim_batch(self, batch_size: int, lease_seconds: float) -> List[Dict[str, Any]]:
+        """
+        Захватывает пачку готовых к доставке событий.
+
+        Захват ограничен по времени: если диспетчер не завершит доставку
+        за lease_seconds, события снова станут доступны для захвата.
+
+        Args:
+            batch_size: Максимальное количество событий в пачке
+            lease_seconds: Длительность захвата в секундах
+
+        Returns:
+            List[Dict[str, Any]]: События с ключами id, event_type,
+                incident_id, payload, created_at и attempts
+        """
+        pass
+
+    @abstractmethod
+    def delete_events(self, ids: Sequence[int]) -> None:
+        """
+        Удаляет доставленные события.
+
+        Args:
+            ids: Идентификаторы событий
+        """
+        pass
+
+    @abstractmethod
+    def reschedule_event(self, id: int, error: str, next_attempt_at: Optional[datetime]) -> None:
+        """
+        Освобождает событие после неудачной доставки.
+
+        Args:
+            id: Идентификатор события
+            error: Описание ошибки доставки
+            next_attempt_at: Момент следующей попытки или None,
+                если попытки исчерпаны
+        """
+        pass
+
+    @abstractmethod
+    def purge_dead_events(self, created_before: datetime) -> int:
+        """
+        Удаляет события с исчерпанными попытками доставки.
+
+        Args:
+            created_before: Удаляются события, созданные раньше этого момента
+
+        Returns:
+            int: Количество удаленных событий
+        """
+        pass
@@ -0,0 +1,25 @@
+from abc import ABC, abstractmethod
+
+class IRateLimitBackend(ABC):
+    """
+    Интерфейс хранилища для ограничения частоты запросов.
+
+    Реализует алгоритм token bucket: у каждого ключа есть корзина
+    вместимостью burst, которая пополняется со скоростью rate токенов в секунду.
+    """
+
+    @abstractmethod
+    async def acquire(self, key: str, rate: float, burst: int) -> float:
+        """
+        Пытается забрать один токен из корзины ключа.
+
+        Args:
+            key: Ключ корзины (например, источник или клиент)
+            rate: Скорость пополнения корзины, токенов в секунду
+            burst: Вместимость корзины
+
+        Returns:
+            float: 0, если токен получен, иначе время в секундах
+                до появления следующего токена
+        """
+        pass
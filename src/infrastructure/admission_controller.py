@@ -0,0 +1,60 @@
+import asyncio
+from typing import Callable, Optional
+
+class AdmissionController:
+    def __init__(
+        self,
+        max_loop_lag: float,
+        max_pool_usage: float,
+        pool_usage: Callable[[], float]
+    ):
+        """
+        Инициализирует контроллер допуска запросов при перегрузке.
+
+        Следит за двумя сигналами перегрузки: задержкой event loop
+        (измеряется фоновой задачей monitor_loop_lag) и долей занятых
+        соединений пула БД.
+
+        Args:
+            max_loop_lag: Допустимая задержка event loop в секундах
+            max_pool_usage: Допустимая доля занятых соединений пула (0..1)
+            pool_usage: Функция, возвращающая текущую долю занятых соединений
+        """
+        self.max_loop_lag = max_loop_lag
+        self.max_pool_usage = max_pool_usage
+        self._pool_usage = pool_usage
+        self.loop_lag = 0.0
+
+    async def monitor_loop_lag(self, interval: float = 0.05) -> None:
+        """
+        Фоновая задача, измеряющая задержку event loop.
+
+        Засыпает на interval и считает, насколько позже запланированного
+        момента loop вернул управление. Пики учитываются сразу, а спад
+        сглаживается, чтобы отбрасывание не "мигало" между запросами.
+
+        Args:
+            interval: Период измерения в секундах
+        """
+        loop = asyncio.get_running_loop()
+        while True:
+            started = loop.time()
+            await asyncio.sleep(interval)
+            lag = max(0.0, loop.time() - started - interval)
+            self.loop_lag = max(lag, self.loop_lag * 0.5)
+
+    def overload_reason(self) -> Optional[str]:
+        """
+        Проверяет, перегружен ли сервис.
+
+        Returns:
+            Optional[str]: Описание причины перегрузки или None
+        """
+        if self.loop_lag > self.max_loop_lag:
+            return f"задержка event loop {self.loop_lag * 1000:.0f} мс"
+
+        pool_usage = self._pool_usage()
+        if pool_usage > self.max_pool_usage:
+            return f"занято {pool_usage:.0%} соединений с БД"
+
+        return None
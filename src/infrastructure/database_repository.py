@@ -1,26 +1,115 @@
-from typing import List
+import json
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from sqlalchemy import select, text, update
 from sqlalchemy.orm import Session
 from domain.incident import Incident
+from domain.incident_list_version import IncidentListVersion
+from domain.incident_status_change import IncidentStatusChange
+from domain.outbox_event import OutboxEvent
 from infrastructure.abstract.database_repository_interface import IDatabaseRepository
 
+# Разница между двумя моментами времени в секундах для поддерживаемых диалектов
+_SECONDS_BETWEEN = {
+    "sqlite": "((julianday({end}) - julianday({start})) * 86400.0)",
+    "postgresql": "EXTRACT(EPOCH FROM ({end} - {start}))",
+}
+
+# Перцентили считаются методом ближайшего ранга по окну, упорядоченному по длительности
+_PERCENTILE_COLUMN = "MIN(CASE WHEN position >= {fraction} * total THEN seconds END) AS p{percentile}_seconds"
+
+_STATUS_DURATIONS_QUERY = """
+WITH transitions AS (
+    SELECT c.incident_id, c.old_status AS status, c.changed_at,
+           LAG(c.changed_at) OVER (PARTITION BY c.incident_id ORDER BY c.changed_at, c.id) AS previous_changed_at
+    FROM incident_status_changes c
+),
+durations AS (
+    SELECT i.source, t.status,
+           {seconds} AS seconds
+    FROM transitions t
+    JOIN incidents i ON i.id = t.incident_id
+),
+ranked AS (
+    SELECT source, status, seconds,
+           ROW_NUMBER() OVER (PARTITION BY source, status ORDER BY seconds) AS position,
+           COUNT(*) OVER (PARTITION BY source, status) AS total
+    FROM durations
+)
+SELECT source, status, COUNT(*) AS count, AVG(seconds) AS avg_seconds{percentile_columns}
+FROM ranked
+GROUP BY source, status
+ORDER BY source, status
+"""
+
+_RESOLUTION_TIMES_QUERY = """
+WITH resolutions AS (
+    SELECT i.source, {seconds} AS seconds
+    FROM incidents i
+    JOIN incident_status_changes c ON c.incident_id = i.id
+    WHERE c.new_status = 'solved'
+    GROUP BY i.id, i.source, i.created_at
+),
+ranked AS (
+    SELECT source, seconds,
+           ROW_NUMBER() OVER (PARTITION BY source ORDER BY seconds) AS position,
+           COUNT(*) OVER (PARTITION BY source) AS total
+    FROM resolutions
+)
+SELECT source, COUNT(*) AS resolved_count, AVG(seconds) AS mttr_seconds{percentile_columns}
+FROM ranked
+GROUP BY source
+ORDER BY source
+"""
+
+def check_dialect_supported(dialect: str) -> None:
+    """
+    Проверяет, что аналитика статусов может выполняться в БД этого диалекта.
+
+    Вызывается при запуске приложения, чтобы неподдерживаемая БД
+    обнаруживалась сразу, а не ошибкой 500 при запросе аналитики.
+
+    Args:
+        dialect: Имя диалекта SQLAlchemy, например "sqlite"
+
+    Raises:
+        ValueError: Если для диалекта нет выражения разницы времени в секундах
+    """
+    if dialect not in _SECONDS_BETWEEN:
+        raise ValueError(
+            f"БД '{dialect}' не поддерживается: аналитика статусов реализована "
+            f"для {', '.join(sorted(_SECONDS_BETWEEN))}"
+        )
+
 class DatabaseRepository(IDatabaseRepository):
-    def __init__(self, session: Session):
+    def __init__(self, session: Session, outbox_enabled: bool = True):
         """
         Инициализирует репозиторий для работы с базой данных.
         
         Args:
             session: Сессия SQLAlchemy для работы с базой данных
+            outbox_enabled: Записывать ли события в outbox. Без получателя
+                событий их некому доставлять, и таблица росла бы без ограничений
         """
         self.session = session
+        self.outbox_enabled = outbox_enabled
 
     def create_incident(self, incident: Incident) -> None:
         """
         Создает новый инцидент в базе данных.
+
+        В той же транзакции записывает событие incident.created в outbox
+        (если он включен) и увеличивает версию списка инцидентов с его статусом.
         
         Args:
             incident: Доменный объект инцидента
         """
         self.session.add(incident)
+        # flush нужен для получения id инцидента до записи события
+        self.session.flush()
+        if self.outbox_enabled:
+            self.session.add(self._outbox_event("incident.created", incident))
+        self._bump_list_version(incident.status)
         self.session.commit()
 
     def get_incidents_by_status(self, status: str) -> List[Incident]:
@@ -31,13 +120,62 @@ class DatabaseRepository(IDatabaseRepository):
             status: Статус инцидентов для фильтрации
             
         Returns:
-            List[Incident]: Список доменных объектов инцидентов
+            List[Incident]: Список доменных объектов инцидентов в порядке id
         """
-        return self.session.query(Incident).filter(Incident.status == status).all()
+        return self.session.query(Incident).filter(Incident.status == status).order_by(Incident.id).all()
+
+    def get_incident_rows_by_status(self, status: str) -> List[Tuple[int, str, str, str, datetime]]:
+        """
+        Возвращает инциденты с указанным статусом кортежами значений.
+
+        Выбираются только колонки: строки не попадают в identity map сессии.
+        
+        Args:
+            status: Статус инцидентов для фильтрации
+            
+        Returns:
+            List[Tuple[int, str, str, str, datetime]]: Кортежи (id, text, status, source, created_at) в порядке id
+        """
+        statement = (
+            select(Incident.id, Incident.text, Incident.status, Incident.source, Incident.created_at)
+            .where(Incident.status == status)
+            .order_by(Incident.id)
+        )
+        return self.session.execute(statement).tuples().all()
+
+    def get_incident(self, id: int) -> Optional[Incident]:
+        """
+        Возвращает инцидент по его идентификатору.
+        
+        Args:
+            id: Идентификатор инцидента
+            
+        Returns:
+            Optional[Incident]: Доменный объект инцидента или None, если инцидент не найден
+        """
+        return self.session.get(Incident, id)
+
+    def get_incidents_by_ids(self, ids: Sequence[int]) -> List[Incident]:
+        """
+        Возвращает инциденты с указанными идентификаторами запросом WHERE id IN (...).
+        
+        Args:
+            ids: Идентификаторы инцидентов
+            
+        Returns:
+            List[Incident]: Список найденных доменных объектов инцидентов
+        """
+        if not ids:
+            return []
+        return self.session.query(Incident).filter(Incident.id.in_(ids)).all()
 
     def update_incident_status(self, id: int, new_status: str) -> None:
         """
         Обновляет статус инцидента по его идентификатору.
+
+        Переход записывается в журнал смены статусов и, если outbox включен,
+        в outbox (событие incident.status_changed) в той же транзакции, там же
+        увеличиваются версии списков старого и нового статусов.
         
         Args:
             id: Идентификатор инцидента
@@ -48,5 +186,152 @@ class DatabaseRepository(IDatabaseRepository):
         if not incident:
             raise ValueError(f"Инцидент с id {id} не найден")
         
+        old_status = incident.status
         incident.status = new_status
-        self.session.commit()
\ No newline at end of file
+
+        if old_status != new_status:
+            self.session.add(IncidentStatusChange(
+                incident_id=incident.id,
+                old_status=old_status,
+                new_status=new_status
+            ))
+            if self.outbox_enabled:
+                self.session.add(self._outbox_event(
+                    "incident.status_changed", incident, old_status=old_status
+                ))
+            self._bump_list_version(old_status)
+            self._bump_list_version(new_status)
+
+        self.session.commit()
+
+    def get_list_version(self, status: str) -> Optional[IncidentListVersion]:
+        """
+        Возвращает версию списка инцидентов с указанным статусом.
+
+        Поиск по первичному ключу небольшой таблицы версий,
+        без обращения к таблице инцидентов.
+
+        Args:
+            status: Статус инцидентов
+
+        Returns:
+            Optional[IncidentListVersion]: Версия списка или None,
+                если список еще ни разу не изменялся
+        """
+        return self.session.get(IncidentListVersion, status)
+
+    def get_status_durations(self, percentiles: Sequence[int]) -> List[Dict[str, Any]]:
+        """
+        Возвращает статистику времени пребывания инцидентов в статусах.
+
+        Расчет целиком выполняется в БД оконными функциями.
+
+        Args:
+            percentiles: Перцентили для расчета (например, 50, 90, 99)
+
+        Returns:
+            List[Dict[str, Any]]: Строки с ключами source, status, count,
+                avg_seconds и p<N>_seconds для каждого перцентиля
+        """
+        seconds = self._seconds_between("t.changed_at", "COALESCE(t.previous_changed_at, i.created_at)")
+        return self._fetch_stats(_STATUS_DURATIONS_QUERY, seconds, percentiles)
+
+    def get_resolution_times(self, percentiles: Sequence[int]) -> List[Dict[str, Any]]:
+        """
+        Возвращает статистику времени решения инцидентов по источникам.
+
+        Расчет целиком выполняется в БД оконными функциями.
+
+        Args:
+            percentiles: Перцентили для расчета (например, 50, 90, 99)
+
+        Returns:
+            List[Dict[str, Any]]: Строки с ключами source, resolved_count,
+                mttr_seconds и p<N>_seconds для каждого перцентиля
+        """
+        seconds = self._seconds_between("MIN(c.changed_at)", "i.created_at")
+        return self._fetch_stats(_RESOLUTION_TIMES_QUERY, seconds, percentiles)
+
+    def _bump_list_version(self, status: str) -> None:
+        """
+        Увеличивает версию списка инцидентов с указанным статусом в текущей транзакции.
+
+        Args:
+            status: Статус инцидентов
+        """
+        now = datetime.now(timezone.utc)
+        result = self.session.execute(
+            update(IncidentListVersion)
+            .where(IncidentListVersion.status == status)
+            .values(version=IncidentListVersion.version + 1, updated_at=now)
+            .execution_options(synchronize_session=False)
+        )
+        if result.rowcount == 0:
+            # Строки статусов создаются вместе с таблицей (миграция 004 и create_all),
+            # вставка нужна только для статуса, которого не было при ее создании
+            self.session.add(IncidentListVersion(status=status, version=1, updated_at=now))
+
+    def _outbox_event(self, event_type: str, incident: Incident, **extra: Any) -> OutboxEvent:
+        """
+        Формирует событие outbox с текущим состоянием инцидента.
+
+        Args:
+            event_type: Тип события
+            incident: Доменный объект инцидента
+            **extra: Дополнительные поля события
+
+        Returns:
+            OutboxEvent: Событие для записи в outbox
+        """
+        payload = {
+            "incident": {
+                "id": incident.id,
+                "text": incident.text,
+                "status": incident.status,
+                "source": incident.source,
+                "created_at": incident.created_at.isoformat() if incident.created_at else None
+            },
+            **extra
+        }
+        return OutboxEvent(
+            event_type=event_type,
+            incident_id=incident.id,
+            payload=json.dumps(payload, ensure_ascii=False)
+        )
+
+    def _seconds_between(self, end: str, start: str) -> str:
+        """
+        Формирует SQL-выражение разницы между моментами времени в секундах.
+
+        Args:
+            end: SQL-выражение конечного момента
+            start: SQL-выражение начального момента
+
+        Returns:
+            str: SQL-выражение для текущего диалекта БД
+
+        Raises:
+            ValueError: Если диалект БД не поддерживается
+        """
+        dialect = self.session.get_bind().dialect.name
+        check_dialect_supported(dialect)
+        return _SECONDS_BETWEEN[dialect].format(end=end, start=start)
+
+    def _fetch_stats(self, query: str, seconds: str, percentiles: Sequence[int]) -> List[Dict[str, Any]]:
+        """
+        Выполняет аналитический запрос с колонками перцентилей.
+
+        Args:
+            query: Шаблон SQL-запроса
+            seconds: SQL-выражение длительности в секундах
+            percentiles: Перцентили для расчета
+
+        Returns:
+            List[Dict[str, Any]]: Строки результата в виде словарей
+        """
+        percentile_columns = "".join(
+            ",\n       " + _PERCENTILE_COLUMN.format(fraction=int(p) / 100, percentile=int(p))
+            for p in percentiles
+        )
+        statement = text(query.format(seconds=seconds, percentile_columns=percentile_columns))
+        return [dict(row) for row in self.session.execute(statement).mappings()]
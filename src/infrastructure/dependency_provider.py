@@ -1,33 +1,78 @@
+from functools import lru_cache
+from contextlib import contextmanager
+from typing import Iterator, Optional
+
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
-from contextlib import contextmanager
+from sqlalchemy.pool import QueuePool
 
+import config
+from controllers.ingestion_guard import IngestionGuard
+from controllers.profiling_middleware import ProfilingMiddleware
+from controllers.traffic_capture_middleware import TrafficCaptureMiddleware
+from infrastructure.abstract.database_repository_interface import IDatabaseRepository
+from infrastructure.abstract.event_sink_interface import IEventSink
+from infrastructure.abstract.outbox_repository_interface import IOutboxRepository
+from infrastructure.abstract.rate_limit_backend_interface import IRateLimitBackend
+from infrastructure.admission_controller import AdmissionController
 from infrastructure.database_repository import DatabaseRepository
+from infrastructure.event_sinks import FileEventSink, HttpEventSink
+from infrastructure.memory_repository import InMemoryDatabaseRepository
+from infrastructure.outbox_repository import OutboxRepository
+from infrastructure.rate_limit_backend import InMemoryRateLimitBackend, RedisRateLimitBackend
+from infrastructure.request_profiler import ProfileStore
+from infrastructure.traffic_recorder import TrafficRecorder
 from services.abstract.incident_interface import IIncidentService
+from services.incident_cache import IncidentCache
 from services.incident_service import IncidentService
+from services.outbox_dispatcher import OutboxDispatcher
 
 """Набор методов для реализации внедрения зависимостей по всему приложению"""
 
+@lru_cache(maxsize=None)
 def _get_database_engine():
     """
     Создает и возвращает движок SQLAlchemy для работы с базой данных.
-    
+
+    Движок создается один раз на процесс и переиспользуется всеми запросами,
+    чтобы не платить за инициализацию диалекта и пула на каждом запросе.
+
     Returns:
         Engine: Объект движка SQLAlchemy
     """
-    return create_engine('sqlite:///incidents.db', echo=True)
+    return create_engine(config.DATABASE_URL, echo=config.SQL_ECHO)
+
+@lru_cache(maxsize=None)
+def _get_session_factory():
+    """
+    Возвращает фабрику сессий, привязанную к общему движку.
+
+    Returns:
+        sessionmaker: Фабрика сессий SQLAlchemy
+    """
+    return sessionmaker(bind=_get_database_engine())
+
+def _get_database_pool_usage() -> float:
+    """
+    Возвращает долю занятых соединений пула БД.
+
+    Returns:
+        float: Доля от 0 до 1, либо 0 для пулов без ограничения размера
+    """
+    pool = _get_database_engine().pool
+    if not isinstance(pool, QueuePool) or pool._max_overflow < 0:
+        return 0.0
+    return pool.checkedout() / (pool.size() + pool._max_overflow)
 
 @contextmanager
 def get_database_session():
     """
     Контекстный менеджер для безопасной работы с сессией БД.
-    
+
     Yields:
         Session: Объект сессии SQLAlchemy
     """
-    engine = _get_database_engine()
-    Session = sessionmaker(bind=engine)
-    session = Session()
+    session = _get_session_factory()()
     try:
         yield session
         session.commit()
@@ -37,32 +82,227 @@ def get_database_session():
     finally:
         session.close()
 
-def get_incident_service() -> IIncidentService:
+def uses_memory_repository() -> bool:
     """
-    Реализация DI для сервиса инцидентов, определяющая тип БД репозитория данного сервиса.
+    Проверяет, настроен ли репозиторий инцидентов в памяти процесса.
 
-    Важно: создает сервис с сессией, которая будет закрыта после использования.
-    Для использования в FastAPI Depends это нормально, так как каждый запрос
-    получает свою сессию.
-    
     Returns:
-        IIncidentService: Сервис для работы с инцидентами
+        bool: True для INCIDENTS_REPOSITORY=memory
+    """
+    return config.REPOSITORY_BACKEND == "memory"
+
+@lru_cache(maxsize=None)
+def get_memory_repository() -> InMemoryDatabaseRepository:
+    """
+    Возвращает общий для процесса репозиторий инцидентов в памяти.
+
+    Returns:
+        InMemoryDatabaseRepository: Репозиторий с журналом и снимками в MEMORY_DATA_DIR
     """
+    return InMemoryDatabaseRepository(
+        data_dir=config.MEMORY_DATA_DIR or None,
+        snapshot_every=config.MEMORY_SNAPSHOT_EVERY,
+        fsync=config.MEMORY_FSYNC
+    )
+
+@contextmanager
+def _incident_repository() -> IDatabaseRepository:
+    """
+    Контекстный менеджер, выбирающий реализацию репозитория по настройке INCIDENTS_REPOSITORY.
+
+    Yields:
+        IDatabaseRepository: Репозиторий в памяти или репозиторий с собственной сессией БД
+    """
+    if uses_memory_repository():
+        yield get_memory_repository()
+        return
     with get_database_session() as session:
-        repository = DatabaseRepository(session=session)
-        service = IncidentService(repository=repository)
-        return service
+        # События пишутся в outbox, только если их есть кому доставить
+        yield DatabaseRepository(session=session, outbox_enabled=bool(config.OUTBOX_SINK))
+
+@lru_cache(maxsize=None)
+def get_incident_cache() -> Optional[IncidentCache]:
+    """
+    Возвращает общий для процесса кеш инцидентов по id.
+
+    Returns:
+        Optional[IncidentCache]: Кеш или None, если он отключен (INCIDENTS_CACHE_SIZE=0)
+            или инциденты и так хранятся в памяти процесса
+    """
+    if config.INCIDENT_CACHE_SIZE <= 0 or uses_memory_repository():
+        return None
+    return IncidentCache(max_size=config.INCIDENT_CACHE_SIZE)
+
+def get_incident_service() -> Iterator[IIncidentService]:
+    """
+    Реализация DI для сервиса инцидентов, определяющая тип БД репозитория данного сервиса.
+
+    Используется как зависимость FastAPI с yield: каждый запрос получает
+    свою сессию, которая закрывается после формирования ответа.
+
+    Yields:
+        IIncidentService: Сервис для работы с инцидентами
+    """
+    with _incident_repository() as repository:
+        yield IncidentService(repository=repository, cache=get_incident_cache())
 
 # Альтернативная версия для использования в тестах или других контекстах
 @contextmanager
 def incident_service_context() -> IIncidentService:
     """
     Контекстный менеджер для работы с сервисом инцидентов.
-    
+
     Yields:
         IIncidentService: Сервис для работы с инцидентами
     """
+    with _incident_repository() as repository:
+        service = IncidentService(repository=repository, cache=get_incident_cache())
+        yield service
+
+@contextmanager
+def outbox_repository_context() -> IOutboxRepository:
+    """
+    Контекстный менеджер для работы с репозиторием outbox в отдельной сессии.
+
+    Yields:
+        IOutboxRepository: Репозиторий outbox событий
+    """
     with get_database_session() as session:
-        repository = DatabaseRepository(session=session)
-        service = IncidentService(repository=repository)
-        yield service
\ No newline at end of file
+        yield OutboxRepository(session=session)
+
+def get_event_sink() -> Optional[IEventSink]:
+    """
+    Возвращает получателя событий outbox по настройке INCIDENTS_OUTBOX_SINK.
+
+    Returns:
+        Optional[IEventSink]: Получатель событий или None, если он не настроен
+    """
+    sink = config.OUTBOX_SINK
+    if not sink:
+        return None
+    if sink.startswith(("http://", "https://")):
+        return HttpEventSink(sink)
+    if sink.startswith("file:"):
+        return FileEventSink(sink[len("file:"):])
+    raise ValueError(f"Неподдерживаемый получатель событий outbox: '{sink}'")
+
+def get_outbox_dispatcher() -> Optional[OutboxDispatcher]:
+    """
+    Реализация DI для фонового диспетчера событий outbox.
+
+    Returns:
+        Optional[OutboxDispatcher]: Диспетчер или None, если получатель событий не настроен
+
+    Raises:
+        ValueError: Если получатель событий задан вместе с репозиторием в памяти,
+            который не ведет outbox: иначе события молча не доставлялись бы
+    """
+    if uses_memory_repository():
+        if config.OUTBOX_SINK:
+            raise ValueError(
+                "INCIDENTS_OUTBOX_SINK не поддерживается с INCIDENTS_REPOSITORY=memory: "
+                "репозиторий в памяти не ведет outbox событий"
+            )
+        return None
+    sink = get_event_sink()
+    if sink is None:
+        return None
+    return OutboxDispatcher(
+        repository_context=outbox_repository_context,
+        sink=sink,
+        batch_size=config.OUTBOX_BATCH_SIZE,
+        concurrency=config.OUTBOX_CONCURRENCY,
+        poll_interval=config.OUTBOX_POLL_INTERVAL,
+        max_attempts=config.OUTBOX_MAX_ATTEMPTS,
+        dead_retention=config.OUTBOX_DEAD_RETENTION
+    )
+
+@lru_cache(maxsize=None)
+def get_rate_limit_backend() -> IRateLimitBackend:
+    """
+    Возвращает хранилище лимитов: общее в Redis, если оно настроено, иначе в памяти процесса.
+
+    Returns:
+        IRateLimitBackend: Хранилище корзин token bucket
+    """
+    if config.RATE_LIMIT_REDIS_URL:
+        return RedisRateLimitBackend(config.RATE_LIMIT_REDIS_URL)
+    return InMemoryRateLimitBackend()
+
+@lru_cache(maxsize=None)
+def get_admission_controller() -> AdmissionController:
+    """
+    Возвращает общий для процесса контроллер допуска запросов при перегрузке.
+
+    Returns:
+        AdmissionController: Контроллер допуска
+    """
+    return AdmissionController(
+        max_loop_lag=config.MAX_EVENT_LOOP_LAG,
+        max_pool_usage=config.MAX_DB_POOL_USAGE,
+        pool_usage=_get_database_pool_usage
+    )
+
+@lru_cache(maxsize=None)
+def get_ingestion_guard() -> IngestionGuard:
+    """
+    Реализация DI для защиты пути приема инцидентов от перегрузки.
+
+    Returns:
+        IngestionGuard: Ограничитель частоты и контроллер допуска для POST /incidents/
+    """
+    return IngestionGuard(
+        backend=get_rate_limit_backend(),
+        admission=get_admission_controller(),
+        source_limits=config.SOURCE_RATE_LIMITS,
+        client_limit=config.CLIENT_RATE_LIMIT,
+        low_priority_sources=config.LOW_PRIORITY_SOURCES,
+        shed_retry_after=config.SHED_RETRY_AFTER
+    )
+
+def get_profiling_middleware() -> Optional[ProfilingMiddleware]:
+    """
+    Реализация DI для middleware профилирования запросов.
+
+    Returns:
+        Optional[ProfilingMiddleware]: Middleware или None, если профилирование не настроено
+            (тогда оно не подключается и не влияет на обработку запросов)
+    """
+    if not config.PROFILING_TOKEN and config.PROFILING_SAMPLE_RATE <= 0:
+        return None
+    return ProfilingMiddleware(
+        store=ProfileStore(config.PROFILING_DIR, keep=config.PROFILING_KEEP),
+        admin_token=config.PROFILING_TOKEN,
+        sample_rate=config.PROFILING_SAMPLE_RATE,
+        interval=config.PROFILING_INTERVAL
+    )
+
+@lru_cache(maxsize=None)
+def get_traffic_recorder() -> Optional[TrafficRecorder]:
+    """
+    Возвращает общую для процесса запись захваченных запросов.
+
+    Returns:
+        Optional[TrafficRecorder]: Запись в файл или None, если захват не настроен
+    """
+    if not config.CAPTURE_FILE:
+        return None
+    return TrafficRecorder(config.CAPTURE_FILE)
+
+def get_traffic_capture_middleware() -> Optional[TrafficCaptureMiddleware]:
+    """
+    Реализация DI для middleware захвата потока запросов.
+
+    Returns:
+        Optional[TrafficCaptureMiddleware]: Middleware или None, если захват не настроен
+            (тогда он не подключается и не влияет на обработку запросов)
+    """
+    recorder = get_traffic_recorder()
+    if recorder is None:
+        return None
+    return TrafficCaptureMiddleware(
+        recorder=recorder,
+        redact_fields=config.CAPTURE_REDACT_FIELDS,
+        sample_rate=config.CAPTURE_SAMPLE_RATE,
+        max_body_size=config.CAPTURE_MAX_BODY_SIZE
+    )
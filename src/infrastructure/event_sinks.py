@@ -0,0 +1,76 @@
+import asyncio
+import json
+import urllib.request
+from typing import Any, Dict
+
+from infrastructure.abstract.event_sink_interface import IEventSink
+
+class FileEventSink(IEventSink):
+    def __init__(self, path: str):
+        """
+        Инициализирует получателя, дописывающего события в файл NDJSON.
+
+        Предназначен для тестов и локальной отладки.
+
+        Args:
+            path: Путь к файлу событий
+        """
+        self.path = path
+        self._lock = asyncio.Lock()
+
+    async def deliver(self, event: Dict[str, Any]) -> None:
+        """
+        Дописывает событие в файл одной строкой JSON.
+
+        Args:
+            event: Событие из outbox
+        """
+        line = json.dumps(event, ensure_ascii=False) + "\n"
+        async with self._lock:
+            await asyncio.to_thread(self._append, line)
+
+    def _append(self, line: str) -> None:
+        with open(self.path, "a", encoding="utf-8") as file:
+            file.write(line)
+
+class HttpEventSink(IEventSink):
+    def __init__(self, url: str, timeout: float = 5.0):
+        """
+        Инициализирует получателя, отправляющего события POST-запросом с телом JSON.
+
+        Args:
+            url: Адрес внешней системы
+            timeout: Таймаут запроса в секундах
+        """
+        self.url = url
+        self.timeout = timeout
+
+    async def deliver(self, event: Dict[str, Any]) -> None:
+        """
+        Отправляет событие во внешнюю систему.
+
+        Блокирующий HTTP-запрос выполняется в пуле потоков, чтобы
+        недоступность получателя не задерживала обработку запросов API.
+
+        Args:
+            event: Событие из outbox
+
+        Raises:
+            Exception: Если получатель недоступен или ответил кодом ошибки
+        """
+        await asyncio.to_thread(self._post, event)
+
+    def _post(self, event: Dict[str, Any]) -> None:
+        request = urllib.request.Request(
+            self.url,
+            data=json.dumps(event, ensure_ascii=False).encode("utf-8"),
+            headers={
+                "Content-Type": "application/json",
+                # Ключ идемпотентности: при повторной доставке получатель может отбросить дубликат
+                "Idempotency-Key": str(event["id"])
+            },
+            method="POST"
+        )
+        # urlopen выбрасывает HTTPError для кодов 4xx/5xx
+        with urllib.request.urlopen(request, timeout=self.timeout) as response:
+            response.read()
@@ -0,0 +1,587 @@
+import json
+import os
+import shutil
+import threading
+from array import array
+from bisect import bisect_left, insort
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import inspect
+
+from domain.incident import Incident
+from domain.incident_list_version import IncidentListVersion
+from infrastructure.abstract.database_repository_interface import IDatabaseRepository
+
+class InMemoryDatabaseRepository(IDatabaseRepository):
+    def __init__(
+        self,
+        data_dir: Optional[str] = None,
+        snapshot_every: int = 10000,
+        fsync: bool = False
+    ):
+        """
+        Инициализирует репозиторий, хранящий инциденты в памяти процесса.
+
+        Инциденты хранятся по колонкам: id совпадает с позицией в массивах,
+        статус и источник закодированы байтами. Поверх колонок построены
+        хеш-индексы по статусу и источнику и упорядоченный индекс по created_at.
+
+        Если задан data_dir, каждая запись дописывается в журнал (log.ndjson),
+        а каждые snapshot_every записей состояние сохраняется в snapshot.json
+        фоновым потоком. На время записи снимка журнал переименовывается
+        в log.prev.ndjson и удаляется только после того, как снимок записан.
+        При запуске снимок загружается, а оба журнала проигрываются поверх него.
+
+        Args:
+            data_dir: Каталог для журнала и снимков; None - без сохранения на диск
+            snapshot_every: Количество записей в журнале между снимками
+            fsync: Выполнять fsync после каждой записи в журнал
+                (иначе данные переживают падение процесса, но не ОС)
+        """
+        self.data_dir = data_dir
+        self.snapshot_every = snapshot_every
+        self.fsync = fsync
+        self._lock = threading.RLock()
+
+        # Колонки инцидентов: индекс в массиве = id - 1
+        self._texts: List[str] = []
+        self._statuses = bytearray()
+        self._sources = bytearray()
+        self._created_at = array('d')
+        # Те же моменты создания готовыми объектами datetime: их построение
+        # при каждом чтении стоило бы больше, чем вся остальная выборка строки
+        self._created_at_datetimes: List[datetime] = []
+
+        # Словари кодирования статусов и источников в байты
+        self._status_names: List[str] = []
+        self._status_codes: Dict[str, int] = {}
+        self._source_names: List[str] = []
+        self._source_codes: Dict[str, int] = {}
+
+        # Индексы: код статуса/источника -> множество id, created_at -> id
+        self._by_status: Dict[int, set] = {}
+        self._by_source: Dict[int, set] = {}
+        self._by_created_at: List[Tuple[float, int]] = []
+
+        # Журнал смены статусов: (incident_id, old_status, new_status, changed_at)
+        self._status_changes: List[Tuple[int, str, str, float]] = []
+        # Версии списков: статус -> (версия, время изменения)
+        self._list_versions: Dict[str, Tuple[int, float]] = {}
+
+        # Порядковый номер последней примененной записи журнала
+        self._sequence = 0
+        self._log_file = None
+        self._log_entries = 0
+        # Поток, записывающий снимок в фоне (не больше одного одновременно)
+        self._snapshot_thread: Optional[threading.Thread] = None
+
+        if data_dir is not None:
+            os.makedirs(data_dir, exist_ok=True)
+            self._restore()
+            self._log_file = open(self._log_path, "a", encoding="utf-8")
+
+    def create_incident(self, incident: Incident) -> None:
+        """
+        Создает новый инцидент в памяти и дописывает его в журнал.
+
+        Outbox событий в этой реализации не ведется.
+
+        Args:
+            incident: Доменный объект инцидента (получает id после записи)
+        """
+        created_at = _to_timestamp(incident.created_at or datetime.now(timezone.utc))
+        with self._lock:
+            entry = {
+                "op": "create",
+                "text": incident.text,
+                "status": incident.status,
+                "source": incident.source,
+                "created_at": created_at
+            }
+            incident.id = self._apply(entry)
+            self._append_log(entry)
+
+    def get_incidents_by_status(self, status: str) -> List[Incident]:
+        """
+        Возвращает список инцидентов с указанным статусом через хеш-индекс.
+
+        Args:
+            status: Статус инцидентов для фильтрации
+
+        Returns:
+            List[Incident]: Список доменных объектов инцидентов в порядке id
+        """
+        with self._lock:
+            code = self._status_codes.get(status)
+            if code is None:
+                return []
+            return [self._materialize(id) for id in sorted(self._by_status[code])]
+
+    def get_incident_rows_by_status(self, status: str) -> List[Tuple[int, str, str, str, datetime]]:
+        """
+        Возвращает инциденты с указанным статусом кортежами, без создания доменных объектов.
+
+        Args:
+            status: Статус инцидентов для фильтрации
+
+        Returns:
+            List[Tuple[int, str, str, str, datetime]]: Кортежи (id, text, status, source, created_at) в порядке id
+        """
+        with self._lock:
+            code = self._status_codes.get(status)
+            if code is None:
+                return []
+            texts = self._texts
+            sources = self._sources
+            source_names = self._source_names
+            created_at = self._created_at_datetimes
+            return [
+                (id, texts[id - 1], status, source_names[sources[id - 1]], created_at[id - 1])
+                for id in sorted(self._by_status[code])
+            ]
+
+    def get_incident(self, id: int) -> Optional[Incident]:
+        """
+        Возвращает инцидент по его идентификатору.
+
+        Args:
+            id: Идентификатор инцидента
+
+        Returns:
+            Optional[Incident]: Доменный объект инцидента или None, если инцидент не найден
+        """
+        with self._lock:
+            if not 1 <= id <= len(self._texts):
+                return None
+            return self._materialize(id)
+
+    def get_incidents_by_ids(self, ids: Sequence[int]) -> List[Incident]:
+        """
+        Возвращает инциденты с указанными идентификаторами.
+
+        Args:
+            ids: Идентификаторы инцидентов
+
+        Returns:
+            List[Incident]: Список найденных доменных объектов инцидентов в порядке ids
+        """
+        with self._lock:
+            count = len(self._texts)
+            return [self._materialize(id) for id in ids if 1 <= id <= count]
+
+    def get_incidents_by_source(self, source: str) -> List[Incident]:
+        """
+        Возвращает список инцидентов с указанным источником через хеш-индекс.
+
+        Args:
+            source: Источник инцидентов
+
+        Returns:
+            List[Incident]: Список доменных объектов инцидентов в порядке id
+        """
+        with self._lock:
+            code = self._source_codes.get(source)
+            if code is None:
+                return []
+            return [self._materialize(id) for id in sorted(self._by_source[code])]
+
+    def get_incidents_created_between(self, start: datetime, end: datetime) -> List[Incident]:
+        """
+        Возвращает инциденты, созданные в полуинтервале [start, end), через упорядоченный индекс.
+
+        Args:
+            start: Начало интервала
+            end: Конец интервала (не включается)
+
+        Returns:
+            List[Incident]: Список доменных объектов инцидентов в порядке создания
+        """
+        with self._lock:
+            left = bisect_left(self._by_created_at, (_to_timestamp(start), 0))
+            right = bisect_left(self._by_created_at, (_to_timestamp(end), 0))
+            return [self._materialize(id) for _, id in self._by_created_at[left:right]]
+
+    def update_incident_status(self, id: int, new_status: str) -> None:
+        """
+        Обновляет статус инцидента и дописывает переход в журнал.
+
+        Вместе со статусом обновляются индекс, журнал смены статусов
+        и версии списков старого и нового статусов.
+
+        Args:
+            id: Идентификатор инцидента
+            new_status: Новый статус инцидента
+        """
+        with self._lock:
+            if not 1 <= id <= len(self._texts):
+                raise ValueError(f"Инцидент с id {id} не найден")
+
+            if self._status_names[self._statuses[id - 1]] == new_status:
+                return
+
+            entry = {
+                "op": "status",
+                "id": id,
+                "status": new_status,
+                "changed_at": _to_timestamp(datetime.now(timezone.utc))
+            }
+            self._apply(entry)
+            self._append_log(entry)
+
+    def get_list_version(self, status: str) -> Optional[IncidentListVersion]:
+        """
+        Возвращает версию списка инцидентов с указанным статусом.
+
+        Args:
+            status: Статус инцидентов
+
+        Returns:
+            Optional[IncidentListVersion]: Версия списка или None,
+                если список еще ни разу не изменялся
+        """
+        with self._lock:
+            list_version = self._list_versions.get(status)
+        if list_version is None:
+            return None
+        version, updated_at = list_version
+        return IncidentListVersion(status=status, version=version, updated_at=_to_datetime(updated_at))
+
+    def get_status_durations(self, percentiles: Sequence[int]) -> List[Dict[str, Any]]:
+        """
+        Возвращает статистику времени пребывания инцидентов в статусах.
+
+        Args:
+            percentiles: Перцентили для расчета (например, 50, 90, 99)
+
+        Returns:
+            List[Dict[str, Any]]: Строки с ключами source, status, count,
+                avg_seconds и p<N>_seconds для каждого перцентиля
+        """
+        groups: Dict[Tuple[str, str], List[float]] = {}
+        with self._lock:
+            previous_changed_at: Dict[int, float] = {}
+            for incident_id, old_status, _, changed_at in self._status_changes:
+                started_at = previous_changed_at.get(incident_id, self._created_at[incident_id - 1])
+                previous_changed_at[incident_id] = changed_at
+                source = self._source_names[self._sources[incident_id - 1]]
+                groups.setdefault((source, old_status), []).append(changed_at - started_at)
+
+        rows = []
+        for (source, status), durations in sorted(groups.items()):
+            row = {"source": source, "status": status}
+            row.update(_aggregate(durations, percentiles, "count", "avg_seconds"))
+            rows.append(row)
+        return rows
+
+    def get_resolution_times(self, percentiles: Sequence[int]) -> List[Dict[str, Any]]:
+        """
+        Возвращает статистику времени решения инцидентов по источникам.
+
+        Args:
+            percentiles: Перцентили для расчета (например, 50, 90, 99)
+
+        Returns:
+            List[Dict[str, Any]]: Строки с ключами source, resolved_count,
+                mttr_seconds и p<N>_seconds для каждого перцентиля
+        """
+        groups: Dict[str, List[float]] = {}
+        with self._lock:
+            resolved = set()
+            for incident_id, _, new_status, changed_at in self._status_changes:
+                if new_status != "solved" or incident_id in resolved:
+                    continue
+                resolved.add(incident_id)
+                source = self._source_names[self._sources[incident_id - 1]]
+                groups.setdefault(source, []).append(changed_at - self._created_at[incident_id - 1])
+
+        rows = []
+        for source, durations in sorted(groups.items()):
+            row = {"source": source}
+            row.update(_aggregate(durations, percentiles, "resolved_count", "mttr_seconds"))
+            rows.append(row)
+        return rows
+
+    def snapshot(self) -> None:
+        """
+        Синхронно сохраняет снимок состояния на диск и очищает журналы.
+
+        Дожидается завершения фонового снимка, если он выполняется.
+        Используется при остановке приложения; во время обработки запросов
+        снимки записываются в фоне (см. _append_log).
+        """
+        if self.data_dir is None:
+            return
+        with self._lock:
+            self._wait_for_snapshot()
+            self._write_snapshot(self._capture_state())
+            self._log_file.close()
+            self._log_file = open(self._log_path, "w", encoding="utf-8")
+            self._log_entries = 0
+            if os.path.exists(self._previous_log_path):
+                os.remove(self._previous_log_path)
+
+    def close(self) -> None:
+        """Сохраняет снимок и закрывает журнал."""
+        if self._log_file is not None:
+            self.snapshot()
+            self._log_file.close()
+            self._log_file = None
+
+    @property
+    def _log_path(self) -> str:
+        return os.path.join(self.data_dir, "log.ndjson")
+
+    @property
+    def _previous_log_path(self) -> str:
+        return os.path.join(self.data_dir, "log.prev.ndjson")
+
+    @property
+    def _snapshot_path(self) -> str:
+        return os.path.join(self.data_dir, "snapshot.json")
+
+    def _capture_state(self) -> Dict[str, Any]:
+        """
+        Копирует состояние для снимка. Вызывается под блокировкой.
+
+        Копируются только плоские массивы, что на порядки быстрее
+        сериализации; раскодирование и запись выполняются вне блокировки.
+        """
+        return {
+            "sequence": self._sequence,
+            "texts": list(self._texts),
+            "statuses": bytes(self._statuses),
+            "status_names": list(self._status_names),
+            "sources": bytes(self._sources),
+            "source_names": list(self._source_names),
+            "created_at": self._created_at.tolist(),
+            "status_changes": list(self._status_changes),
+            "list_versions": dict(self._list_versions)
+        }
+
+    def _write_snapshot(self, captured: Dict[str, Any]) -> None:
+        """
+        Записывает скопированное состояние во временный файл
+        и атомарно заменяет им предыдущий снимок.
+        """
+        status_names = captured.pop("status_names")
+        source_names = captured.pop("source_names")
+        captured["statuses"] = [status_names[code] for code in captured["statuses"]]
+        captured["sources"] = [source_names[code] for code in captured["sources"]]
+
+        temporary_path = self._snapshot_path + ".tmp"
+        with open(temporary_path, "w", encoding="utf-8") as file:
+            json.dump(captured, file, ensure_ascii=False)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temporary_path, self._snapshot_path)
+
+    def _start_background_snapshot(self) -> None:
+        """
+        Переключает журнал и запускает запись снимка в фоне. Вызывается под блокировкой.
+
+        Записи до текущей переносятся в log.prev.ndjson и остаются на диске,
+        пока снимок не будет записан, новые записи идут в пустой log.ndjson.
+        """
+        self._log_file.close()
+        if os.path.exists(self._previous_log_path):
+            # Предыдущий фоновый снимок не был записан: его журнал еще нужен
+            with open(self._log_path, "rb") as source, open(self._previous_log_path, "ab") as target:
+                shutil.copyfileobj(source, target)
+            os.remove(self._log_path)
+        else:
+            os.replace(self._log_path, self._previous_log_path)
+        self._log_file = open(self._log_path, "a", encoding="utf-8")
+        self._log_entries = 0
+
+        self._snapshot_thread = threading.Thread(
+            target=self._finish_background_snapshot,
+            args=(self._capture_state(),),
+            name="memory-repository-snapshot",
+            daemon=True
+        )
+        self._snapshot_thread.start()
+
+    def _finish_background_snapshot(self, captured: Dict[str, Any]) -> None:
+        self._write_snapshot(captured)
+        os.remove(self._previous_log_path)
+
+    def _wait_for_snapshot(self) -> None:
+        if self._snapshot_thread is not None:
+            self._snapshot_thread.join()
+            self._snapshot_thread = None
+
+    def _apply(self, entry: Dict[str, Any]) -> int:
+        """
+        Применяет запись журнала к состоянию в памяти.
+
+        Args:
+            entry: Запись журнала (op = "create" или "status")
+
+        Returns:
+            int: Идентификатор затронутого инцидента
+        """
+        self._sequence += 1
+
+        if entry["op"] == "create":
+            id = self._append_row(entry["text"], entry["status"], entry["source"], entry["created_at"])
+            self._bump_list_version(entry["status"], entry["created_at"])
+            return id
+
+        id = entry["id"]
+        old_code = self._statuses[id - 1]
+        new_code = self._encode_status(entry["status"])
+        old_status = self._status_names[old_code]
+        self._statuses[id - 1] = new_code
+        self._by_status[old_code].discard(id)
+        self._by_status.setdefault(new_code, set()).add(id)
+        self._status_changes.append((id, old_status, entry["status"], entry["changed_at"]))
+        self._bump_list_version(old_status, entry["changed_at"])
+        self._bump_list_version(entry["status"], entry["changed_at"])
+        return id
+
+    def _append_row(self, text: str, status: str, source: str, created_at: float) -> int:
+        """
+        Добавляет инцидент в колонки и индексы.
+
+        Returns:
+            int: Идентификатор нового инцидента
+        """
+        id = len(self._texts) + 1
+        status_code = self._encode_status(status)
+        source_code = self._encode_source(source)
+        self._texts.append(text)
+        self._statuses.append(status_code)
+        self._sources.append(source_code)
+        self._created_at.append(created_at)
+        self._created_at_datetimes.append(_to_datetime(created_at))
+        self._by_status.setdefault(status_code, set()).add(id)
+        self._by_source.setdefault(source_code, set()).add(id)
+        # Инциденты почти всегда создаются по возрастанию времени,
+        # поэтому вставка обычно происходит в конец списка
+        insort(self._by_created_at, (created_at, id))
+        return id
+
+    def _append_log(self, entry: Dict[str, Any]) -> None:
+        """Дописывает примененную запись в журнал и при необходимости делает снимок."""
+        if self._log_file is None:
+            return
+        self._log_file.write(json.dumps({"seq": self._sequence, **entry}, ensure_ascii=False) + "\n")
+        self._log_file.flush()
+        if self.fsync:
+            os.fsync(self._log_file.fileno())
+
+        self._log_entries += 1
+        # Снимок пишется в фоне: под блокировкой только копируются массивы,
+        # поэтому запрос, на котором сработал порог, не ждет сериализацию и fsync
+        snapshot_running = self._snapshot_thread is not None and self._snapshot_thread.is_alive()
+        if self._log_entries >= self.snapshot_every and not snapshot_running:
+            self._start_background_snapshot()
+
+    def _restore(self) -> None:
+        """Загружает последний снимок и проигрывает журналы поверх него."""
+        if os.path.exists(self._snapshot_path):
+            with open(self._snapshot_path, encoding="utf-8") as file:
+                state = json.load(file)
+            for row in zip(state["texts"], state["statuses"], state["sources"], state["created_at"]):
+                self._append_row(*row)
+            self._status_changes = [tuple(change) for change in state["status_changes"]]
+            self._list_versions = {
+                status: tuple(list_version) for status, list_version in state["list_versions"].items()
+            }
+            self._sequence = state["sequence"]
+
+        # Журнал незавершенного фонового снимка старше текущего журнала
+        for path in (self._previous_log_path, self._log_path):
+            if os.path.exists(path):
+                self._replay_log(path)
+
+    def _replay_log(self, path: str) -> None:
+        """Проигрывает записи журнала, еще не вошедшие в состояние."""
+        with open(path, "rb+") as file:
+            valid_length = 0
+            for line in file:
+                try:
+                    if not line.endswith(b"\n"):
+                        raise ValueError("Неполная запись журнала")
+                    entry = json.loads(line)
+                except ValueError:
+                    # Последняя строка могла быть записана не полностью при падении
+                    # процесса: она отбрасывается, чтобы новые записи не склеились с ней
+                    file.truncate(valid_length)
+                    break
+                valid_length += len(line)
+                if entry.pop("seq") > self._sequence:
+                    self._apply(entry)
+                    self._log_entries += 1
+
+    def _bump_list_version(self, status: str, changed_at: float) -> None:
+        version, _ = self._list_versions.get(status, (0, changed_at))
+        self._list_versions[status] = (version + 1, changed_at)
+
+    def _encode_status(self, status: str) -> int:
+        code = self._status_codes.get(status)
+        if code is None:
+            code = self._status_codes[status] = len(self._status_names)
+            self._status_names.append(status)
+        return code
+
+    def _encode_source(self, source: str) -> int:
+        code = self._source_codes.get(source)
+        if code is None:
+            code = self._source_codes[source] = len(self._source_names)
+            self._source_names.append(source)
+        return code
+
+    def _materialize(self, id: int) -> Incident:
+        """
+        Собирает доменный объект инцидента из колонок.
+
+        Как и загрузчик SQLAlchemy, минует __init__ и отслеживание изменений
+        атрибутов: это примерно на порядок дешевле обычного конструктора.
+        """
+        incident = _new_incident()
+        incident.__dict__.update(
+            id=id,
+            text=self._texts[id - 1],
+            status=self._status_names[self._statuses[id - 1]],
+            source=self._source_names[self._sources[id - 1]],
+            created_at=self._created_at_datetimes[id - 1]
+        )
+        return incident
+
+
+# Создает экземпляр Incident с состоянием SQLAlchemy, не вызывая __init__
+_new_incident = inspect(Incident).class_manager.new_instance
+
+
+def _to_timestamp(moment: datetime) -> float:
+    """Переводит время в секунды UTC; время без часового пояса считается UTC."""
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return moment.timestamp()
+
+
+def _to_datetime(timestamp: float) -> datetime:
+    """Переводит секунды UTC во время UTC без часового пояса, как его возвращает DatabaseRepository."""
+    return datetime.fromtimestamp(timestamp, tz=timezone.utc).replace(tzinfo=None)
+
+
+def _aggregate(
+    durations: List[float],
+    percentiles: Sequence[int],
+    count_key: str,
+    average_key: str
+) -> Dict[str, Any]:
+    """
+    Считает количество, среднее и перцентили методом ближайшего ранга,
+    как и SQL-запросы DatabaseRepository.
+    """
+    durations = sorted(durations)
+    total = len(durations)
+    row = {count_key: total, average_key: sum(durations) / total}
+    for p in percentiles:
+        # Первая позиция (с 1), для которой position >= p/100 * total
+        position = max(1, -(-int(p) * total // 100))
+        row[f"p{int(p)}_seconds"] = durations[position - 1]
+    return row
@@ -0,0 +1,128 @@
+import json
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Sequence
+
+from sqlalchemy import delete, or_, select, update
+from sqlalchemy.orm import Session
+
+from domain.outbox_event import OutboxEvent
+from infrastructure.abstract.outbox_repository_interface import IOutboxRepository
+
+class OutboxRepository(IOutboxRepository):
+    def __init__(self, session: Session):
+        """
+        Инициализирует репозиторий для работы с outbox событий.
+
+        Args:
+            session: Сессия SQLAlchemy для работы с базой данных
+        """
+        self.session = session
+
+    def claim_batch(self, batch_size: int, lease_seconds: float) -> List[Dict[str, Any]]:
+        """
+        Захватывает пачку готовых к доставке событий.
+
+        Захват выполняется одним UPDATE с уникальным токеном, поэтому
+        несколько диспетчеров не получат одно и то же событие.
+
+        Args:
+            batch_size: Максимальное количество событий в пачке
+            lease_seconds: Длительность захвата в секундах
+
+        Returns:
+            List[Dict[str, Any]]: События с ключами id, event_type,
+                incident_id, payload, created_at и attempts
+        """
+        now = datetime.now(timezone.utc)
+        token = str(uuid.uuid4())
+
+        ready = (
+            select(OutboxEvent.id)
+            .where(
+                OutboxEvent.next_attempt_at <= now,
+                or_(OutboxEvent.claimed_until.is_(None), OutboxEvent.claimed_until < now)
+            )
+            .order_by(OutboxEvent.id)
+            .limit(batch_size)
+        )
+        self.session.execute(
+            update(OutboxEvent)
+            .where(OutboxEvent.id.in_(ready))
+            .values(claim_token=token, claimed_until=now + timedelta(seconds=lease_seconds))
+            .execution_options(synchronize_session=False)
+        )
+        self.session.commit()
+
+        events = self.session.execute(
+            select(OutboxEvent).where(OutboxEvent.claim_token == token).order_by(OutboxEvent.id)
+        ).scalars()
+        return [
+            {
+                "id": event.id,
+                "event_type": event.event_type,
+                "incident_id": event.incident_id,
+                "payload": json.loads(event.payload),
+                "created_at": event.created_at.isoformat(),
+                "attempts": event.attempts
+            }
+            for event in events
+        ]
+
+    def delete_events(self, ids: Sequence[int]) -> None:
+        """
+        Удаляет доставленные события.
+
+        Args:
+            ids: Идентификаторы событий
+        """
+        if not ids:
+            return
+        self.session.execute(
+            delete(OutboxEvent)
+            .where(OutboxEvent.id.in_(ids))
+            .execution_options(synchronize_session=False)
+        )
+        self.session.commit()
+
+    def reschedule_event(self, id: int, error: str, next_attempt_at: Optional[datetime]) -> None:
+        """
+        Освобождает событие после неудачной доставки.
+
+        Args:
+            id: Идентификатор события
+            error: Описание ошибки доставки
+            next_attempt_at: Момент следующей попытки или None,
+                если попытки исчерпаны
+        """
+        self.session.execute(
+            update(OutboxEvent)
+            .where(OutboxEvent.id == id)
+            .values(
+                attempts=OutboxEvent.attempts + 1,
+                last_error=error,
+                next_attempt_at=next_attempt_at,
+                claim_token=None,
+                claimed_until=None
+            )
+            .execution_options(synchronize_session=False)
+        )
+        self.session.commit()
+
+    def purge_dead_events(self, created_before: datetime) -> int:
+        """
+        Удаляет события с исчерпанными попытками доставки (next_attempt_at IS NULL).
+
+        Args:
+            created_before: Удаляются события, созданные раньше этого момента
+
+        Returns:
+            int: Количество удаленных событий
+        """
+        result = self.session.execute(
+            delete(OutboxEvent)
+            .where(OutboxEvent.next_attempt_at.is_(None), OutboxEvent.created_at < created_before)
+            .execution_options(synchronize_session=False)
+        )
+        self.session.commit()
+        return result.rowcount
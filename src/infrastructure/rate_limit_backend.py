@@ -0,0 +1,119 @@
+import time
+from collections import OrderedDict
+
+from infrastructure.abstract.rate_limit_backend_interface import IRateLimitBackend
+
+class InMemoryRateLimitBackend(IRateLimitBackend):
+    def __init__(self, max_keys: int = 10000):
+        """
+        Инициализирует хранилище лимитов в памяти процесса.
+
+        Корзины хранятся в порядке последнего обращения: при превышении
+        max_keys вытесняются давно неиспользуемые (например, старые клиенты).
+
+        Args:
+            max_keys: Максимальное количество одновременно хранимых корзин
+        """
+        self.max_keys = max_keys
+        self._buckets = OrderedDict()
+
+    async def acquire(self, key: str, rate: float, burst: int) -> float:
+        """
+        Пытается забрать один токен из корзины ключа.
+
+        Args:
+            key: Ключ корзины
+            rate: Скорость пополнения корзины, токенов в секунду
+            burst: Вместимость корзины
+
+        Returns:
+            float: 0, если токен получен, иначе время ожидания в секундах
+        """
+        now = time.monotonic()
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            tokens = float(burst)
+            if len(self._buckets) >= self.max_keys:
+                self._buckets.popitem(last=False)
+        else:
+            tokens, updated_at = bucket
+            tokens = min(float(burst), tokens + (now - updated_at) * rate)
+            self._buckets.move_to_end(key)
+
+        wait = 0.0
+        if tokens >= 1:
+            tokens -= 1
+        else:
+            wait = (1 - tokens) / rate
+
+        self._buckets[key] = (tokens, now)
+        return wait
+
+
+# Атомарный token bucket на стороне Redis. Время берется с сервера Redis,
+# чтобы корзина была общей для процессов с разными часами
+_REDIS_TOKEN_BUCKET_SCRIPT = """
+local rate = tonumber(ARGV[1])
+local burst = tonumber(ARGV[2])
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+
+local bucket = redis.call('HMGET', KEYS[1], 'tokens', 'updated_at')
+local tokens = tonumber(bucket[1]) or burst
+local updated_at = tonumber(bucket[2]) or now
+tokens = math.min(burst, tokens + (now - updated_at) * rate)
+
+local wait = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+else
+    wait = (1 - tokens) / rate
+end
+
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'updated_at', tostring(now))
+redis.call('EXPIRE', KEYS[1], math.ceil(burst / rate) + 1)
+return tostring(wait)
+"""
+
+class RedisRateLimitBackend(IRateLimitBackend):
+    def __init__(self, url: str, prefix: str = "incidents:rate:"):
+        """
+        Инициализирует общее для нескольких процессов хранилище лимитов в Redis.
+
+        Требует установленного пакета redis (pip install redis).
+
+        Args:
+            url: Адрес Redis, например redis://localhost:6379/0
+            prefix: Префикс ключей корзин в Redis
+        """
+        try:
+            import redis.asyncio as redis
+        except ImportError as e:
+            raise ImportError(
+                "Для общего хранилища лимитов необходим пакет redis: pip install redis"
+            ) from e
+
+        self.prefix = prefix
+        self._client = redis.from_url(url)
+        self._script = self._client.register_script(_REDIS_TOKEN_BUCKET_SCRIPT)
+
+    async def acquire(self, key: str, rate: float, burst: int) -> float:
+        """
+        Пытается забрать один токен из корзины ключа в Redis.
+
+        При недоступности Redis запрос пропускается, чтобы сбой хранилища
+        лимитов не останавливал прием инцидентов.
+
+        Args:
+            key: Ключ корзины
+            rate: Скорость пополнения корзины, токенов в секунду
+            burst: Вместимость корзины
+
+        Returns:
+            float: 0, если токен получен, иначе время ожидания в секундах
+        """
+        try:
+            wait = await self._script(keys=[self.prefix + key], args=[rate, burst])
+        except Exception:
+            return 0.0
+        return float(wait)
@@ -0,0 +1,191 @@
+import json
+import os
+import sys
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+# Слои приложения, на которые раскладывается время запроса. Стек просматривается
+# от листа к корню, и сэмпл относится к первому слою, которому принадлежит кадр
+_LAYER_RULES = (
+    ("sql", ("sqlalchemy/engine/", "sqlalchemy/dialects/", "sqlalchemy/pool/")),
+    ("serialization", ("fastapi/encoders.py", "pydantic/", "pydantic_core/", "json/", "starlette/responses.py")),
+    ("repository", ("infrastructure/database_repository.py", "infrastructure/memory_repository.py")),
+    ("service", ("services/",)),
+    ("router", ("controllers/",)),
+)
+
+# Кадр стека: (имя функции, файл, строка начала функции)
+Frame = Tuple[str, str, int]
+
+
+def _layer_of(stack: List[Frame]) -> str:
+    """
+    Определяет слой приложения для сэмпла.
+
+    Args:
+        stack: Кадры стека от корня к листу
+
+    Returns:
+        str: Название слоя или "framework", если ни один слой не найден
+    """
+    for name, filename, _ in reversed(stack):
+        path = filename.replace("\\", "/")
+        if name == "serialize_response" and path.endswith("fastapi/routing.py"):
+            return "serialization"
+        for layer, markers in _LAYER_RULES:
+            if any(marker in path for marker in markers):
+                return layer
+    return "framework"
+
+
+class SamplingProfiler:
+    def __init__(self, thread_id: int, interval: float = 0.001, max_depth: int = 128):
+        """
+        Инициализирует сэмплирующий профилировщик одного потока.
+
+        Отдельный поток периодически снимает стек целевого потока через
+        sys._current_frames(), поэтому профилируемый код не инструментируется.
+        Для асинхронного приложения целевым потоком является поток event loop:
+        в сэмплы могут попасть и конкурентные запросы, обслуживаемые тем же loop.
+
+        Args:
+            thread_id: Идентификатор профилируемого потока
+            interval: Период сэмплирования в секундах
+            max_depth: Максимальная глубина сохраняемого стека
+        """
+        self.thread_id = thread_id
+        self.interval = interval
+        self.max_depth = max_depth
+        self.samples: List[Tuple[List[Frame], float]] = []
+        self.started_at = 0.0
+        self.duration = 0.0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        """Запускает поток сэмплирования."""
+        self.started_at = time.perf_counter()
+        self._thread = threading.Thread(target=self._run, name="request-profiler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Останавливает поток сэмплирования и дожидается его завершения."""
+        self._stop.set()
+        self._thread.join()
+        self.duration = time.perf_counter() - self.started_at
+
+    def _run(self) -> None:
+        last_sample_at = time.perf_counter()
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            now = time.perf_counter()
+            if frame is None:
+                continue
+
+            stack: List[Frame] = []
+            while frame is not None and len(stack) < self.max_depth:
+                code = frame.f_code
+                stack.append((code.co_name, code.co_filename, code.co_firstlineno))
+                frame = frame.f_back
+            stack.reverse()
+
+            # Вес сэмпла - реальное время с предыдущего сэмпла, а не номинальный период
+            self.samples.append((stack, now - last_sample_at))
+            last_sample_at = now
+
+    def layer_totals(self) -> Dict[str, float]:
+        """
+        Распределяет время сэмплов по слоям приложения.
+
+        Returns:
+            Dict[str, float]: Слой -> время в секундах
+        """
+        totals: Dict[str, float] = {}
+        for stack, weight in self.samples:
+            layer = _layer_of(stack)
+            totals[layer] = totals.get(layer, 0.0) + weight
+        return totals
+
+    def to_speedscope(self, name: str) -> dict:
+        """
+        Формирует профиль в формате speedscope (https://www.speedscope.app).
+
+        Args:
+            name: Название профиля
+
+        Returns:
+            dict: Документ speedscope с одним профилем типа "sampled"
+        """
+        frame_indexes: Dict[Frame, int] = {}
+        frames = []
+        samples = []
+        weights = []
+        for stack, weight in self.samples:
+            indexes = []
+            for frame in stack:
+                index = frame_indexes.get(frame)
+                if index is None:
+                    index = frame_indexes[frame] = len(frames)
+                    frames.append({"name": frame[0], "file": frame[1], "line": frame[2]})
+                indexes.append(index)
+            samples.append(indexes)
+            weights.append(weight * 1000)
+
+        return {
+            "$schema": "https://www.speedscope.app/file-format-schema.json",
+            "name": name,
+            "exporter": "incident-api request profiler",
+            "shared": {"frames": frames},
+            "profiles": [{
+                "type": "sampled",
+                "name": name,
+                "unit": "milliseconds",
+                "startValue": 0,
+                "endValue": self.duration * 1000,
+                "samples": samples,
+                "weights": weights
+            }]
+        }
+
+
+class ProfileStore:
+    def __init__(self, directory: str, keep: int = 50):
+        """
+        Инициализирует кольцевое хранилище профилей на диске.
+
+        Args:
+            directory: Каталог для файлов профилей
+            keep: Количество хранимых профилей (не меньше 1); более старые удаляются
+
+        Raises:
+            ValueError: Если keep меньше 1
+        """
+        if keep < 1:
+            raise ValueError(f"Количество хранимых профилей должно быть не меньше 1, получено {keep}")
+        self.directory = directory
+        self.keep = keep
+        self._lock = threading.Lock()
+
+    def save(self, profile_id: str, document: dict) -> str:
+        """
+        Сохраняет профиль и удаляет самые старые сверх лимита.
+
+        Args:
+            profile_id: Идентификатор профиля (используется в имени файла)
+            document: Документ speedscope
+
+        Returns:
+            str: Имя сохраненного файла
+        """
+        filename = f"{profile_id}.speedscope.json"
+        with self._lock:
+            os.makedirs(self.directory, exist_ok=True)
+            with open(os.path.join(self.directory, filename), "w", encoding="utf-8") as file:
+                json.dump(document, file)
+
+            # Имена начинаются со времени создания, поэтому сортировка по имени хронологическая
+            profiles = sorted(name for name in os.listdir(self.directory) if name.endswith(".speedscope.json"))
+            for name in profiles[:len(profiles) - self.keep]:
+                os.remove(os.path.join(self.directory, name))
+        return filename
@@ -0,0 +1,80 @@
+import json
+import os
+import queue
+import threading
+from typing import Optional
+
+# Маркер остановки потока записи
+_STOP = object()
+
+
+class TrafficRecorder:
+    def __init__(self, path: str, fsync: bool = False):
+        """
+        Инициализирует запись захваченных запросов в файл NDJSON.
+
+        Записи ставятся в очередь и пишутся отдельным потоком, поэтому
+        обработка запроса не ждет файловый ввод-вывод. Файл открывается
+        на дозапись: несколько запусков накапливают трафик в одном файле.
+
+        Args:
+            path: Путь к файлу NDJSON
+            fsync: Выполнять fsync после каждой пачки записей
+        """
+        self.path = path
+        self.fsync = fsync
+        self._queue: "queue.SimpleQueue[object]" = queue.SimpleQueue()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def record(self, entry: dict) -> None:
+        """
+        Ставит запись в очередь на сохранение.
+
+        Args:
+            entry: Запись о запросе, сериализуемая в JSON
+        """
+        if self._thread is None:
+            self._start()
+        self._queue.put(entry)
+
+    def close(self) -> None:
+        """Дописывает накопленные записи и останавливает поток записи."""
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is not None:
+            self._queue.put(_STOP)
+            thread.join()
+
+    def _start(self) -> None:
+        with self._lock:
+            if self._thread is not None:
+                return
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._thread = threading.Thread(target=self._run, name="traffic-recorder", daemon=True)
+            self._thread.start()
+
+    def _run(self) -> None:
+        with open(self.path, "a", encoding="utf-8") as file:
+            while True:
+                entry = self._queue.get()
+                stop = entry is _STOP
+                if not stop:
+                    file.write(json.dumps(entry, ensure_ascii=False) + "\n")
+                    # Все уже накопленные записи пишутся одной пачкой
+                    while True:
+                        try:
+                            entry = self._queue.get_nowait()
+                        except queue.Empty:
+                            break
+                        if entry is _STOP:
+                            stop = True
+                            break
+                        file.write(json.dumps(entry, ensure_ascii=False) + "\n")
+                file.flush()
+                if self.fsync:
+                    os.fsync(file.fileno())
+                if stop:
+                    return
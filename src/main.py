@@ -1,30 +1,80 @@
 from fastapi import FastAPI, status
 from controllers.api import router as incident_router
-from contextlib import asynccontextmanager
+from contextlib import asynccontextmanager, suppress
+import asyncio
 
-from infrastructure.dependency_provider import _get_database_engine
+import config
+from infrastructure.dependency_provider import (
+    _get_database_engine, get_admission_controller, get_memory_repository,
+    get_outbox_dispatcher, get_profiling_middleware, get_traffic_capture_middleware,
+    get_traffic_recorder, uses_memory_repository
+)
 from domain.incident import Base
+from infrastructure.database_repository import check_dialect_supported
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    # Startup: инициализация базы данных
+    # Startup: инициализация базы данных.
+    # Движок кешируется и переиспользуется первым и последующими запросами
     engine = _get_database_engine()
-    Base.metadata.create_all(bind=engine)
+    if uses_memory_repository():
+        # Восстановление инцидентов из снимка и журнала
+        get_memory_repository()
+    else:
+        # Неподдерживаемая БД останавливает запуск, а не дает 500 на аналитике
+        check_dialect_supported(engine.dialect.name)
+        Base.metadata.create_all(bind=engine)
     print("База данных инициализирована")
+    # Фоновое измерение задержки event loop для отбрасывания нагрузки
+    background_tasks = [asyncio.create_task(get_admission_controller().monitor_loop_lag())]
+    # Фоновая доставка событий outbox во внешние системы
+    outbox_dispatcher = get_outbox_dispatcher()
+    if outbox_dispatcher is not None:
+        background_tasks.append(asyncio.create_task(outbox_dispatcher.run()))
     yield
     # Shutdown: очистка ресурсов
+    for task in background_tasks:
+        task.cancel()
+    for task in background_tasks:
+        with suppress(asyncio.CancelledError):
+            await task
+    if uses_memory_repository():
+        get_memory_repository().close()
+    # Дописываем захваченные запросы, оставшиеся в очереди
+    traffic_recorder = get_traffic_recorder()
+    if traffic_recorder is not None:
+        traffic_recorder.close()
+    engine.dispose()
     print("Приложение завершает работу")
 
+# Схема OpenAPI строится FastAPI лениво, при первом обращении к /openapi.json.
+# При отключенной документации она не строится вовсе
 app = FastAPI(
     title="Incident Management API",
     description="API для управления инцидентами",
     version="1.0.0",
-    lifespan=lifespan
+    lifespan=lifespan,
+    openapi_url="/openapi.json" if config.DOCS_ENABLED else None,
+    docs_url="/docs" if config.DOCS_ENABLED else None,
+    redoc_url="/redoc" if config.DOCS_ENABLED else None
 )
 
 # Подключаем роутер
 app.include_router(incident_router)
 
+# Профилирование запросов подключается только при наличии настроек,
+# иначе на пути обработки запроса нет никаких дополнительных проверок
+profiling_middleware = get_profiling_middleware()
+if profiling_middleware is not None:
+    app.middleware("http")(profiling_middleware)
+
+# Захват потока запросов для воспроизведения нагрузки подключается так же, только по настройке.
+# Middleware добавляется последним и поэтому оборачивает профилирование: в записанную
+# длительность входит вся обработка запроса приложением
+traffic_capture_middleware = get_traffic_capture_middleware()
+if traffic_capture_middleware is not None:
+    app.middleware("http")(traffic_capture_middleware)
+
 @app.get("/")
 async def root():
     return {"message": "Incident Management System API"}
@@ -35,4 +85,4 @@ async def health_check():
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000)
\ No newline at end of file
+    uvicorn.run(app, host="0.0.0.0", port=8000)
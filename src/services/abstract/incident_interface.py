@@ -1,6 +1,8 @@
 from abc import ABC, abstractmethod
-from typing import List
+from datetime import datetime
+from typing import List, Optional, Sequence, Tuple
 
+from services.dto.analytics_dto import SourceAnalyticsDTO
 from services.dto.incident_dto import IncidentDTO
 
 class IIncidentService(ABC):
@@ -28,6 +30,50 @@ class IIncidentService(ABC):
         """
         pass
 
+    @abstractmethod
+    def get_incident(self, id: int) -> Optional[IncidentDTO]:
+        """
+        Возвращает инцидент по его идентификатору.
+        
+        Args:
+            id: Идентификатор инцидента
+            
+        Returns:
+            Optional[IncidentDTO]: DTO инцидента или None, если инцидент не найден
+        """
+        pass
+
+    @abstractmethod
+    def get_incidents_by_ids(self, ids: Sequence[int]) -> List[IncidentDTO]:
+        """
+        Возвращает инциденты с указанными идентификаторами.
+        
+        Args:
+            ids: Идентификаторы инцидентов
+            
+        Returns:
+            List[IncidentDTO]: DTO найденных инцидентов в порядке ids;
+                отсутствующие и повторяющиеся идентификаторы пропускаются
+        """
+        pass
+
+    @abstractmethod
+    def get_incidents_version(self, status: str) -> Tuple[int, Optional[datetime]]:
+        """
+        Возвращает версию списка инцидентов с указанным статусом.
+
+        Версия меняется при любом изменении списка и позволяет отвечать
+        на условные запросы без чтения самих инцидентов.
+        
+        Args:
+            status: Статус инцидентов
+            
+        Returns:
+            Tuple[int, Optional[datetime]]: Номер версии и время последнего изменения
+                (0 и None, если список еще ни разу не изменялся)
+        """
+        pass
+
     @abstractmethod
     def update_status(self, id: int, new_status: str) -> int:
         """
@@ -42,4 +88,15 @@ class IIncidentService(ABC):
                 0 - операция выполнена успешно
                 2 - инцидент с указанным id не найден
         """
-        pass
\ No newline at end of file
+        pass
+
+    @abstractmethod
+    def get_status_analytics(self) -> List[SourceAnalyticsDTO]:
+        """
+        Возвращает аналитику по журналу смены статусов для каждого источника:
+        MTTR, перцентили времени решения и времени пребывания в статусах.
+            
+        Returns:
+            List[SourceAnalyticsDTO]: Аналитика по источникам
+        """
+        pass
@@ -0,0 +1,33 @@
+from typing import Dict, List, Optional
+
+class StatusDurationDTO:
+    """DTO статистики времени пребывания инцидентов в одном статусе"""
+
+    def __init__(
+        self,
+        status: str,
+        count: int,
+        avg_seconds: float,
+        percentiles: Dict[int, float]
+    ):
+        self.status = status
+        self.count = count
+        self.avg_seconds = avg_seconds
+        self.percentiles = percentiles
+
+class SourceAnalyticsDTO:
+    """DTO аналитики статусов для одного источника инцидентов"""
+
+    def __init__(
+        self,
+        source: str,
+        resolved_count: int = 0,
+        mttr_seconds: Optional[float] = None,
+        resolution_percentiles: Optional[Dict[int, float]] = None,
+        time_in_status: Optional[List[StatusDurationDTO]] = None
+    ):
+        self.source = source
+        self.resolved_count = resolved_count
+        self.mttr_seconds = mttr_seconds
+        self.resolution_percentiles = resolution_percentiles or {}
+        self.time_in_status = time_in_status or []
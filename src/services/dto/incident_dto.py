@@ -1,5 +1,5 @@
 from datetime import datetime, timezone
-from typing import Optional, Union
+from typing import Optional, Tuple, Union
 from enum import Enum
 
 class IncidentStatus(str, Enum):
@@ -29,6 +29,24 @@ class IncidentDTO:
         self.source = self._validate_source(source)
         self.created_at = created_at or datetime.now(timezone.utc)
 
+    @classmethod
+    def from_row(cls, row: Tuple[int, str, str, str, datetime]) -> "IncidentDTO":
+        """
+        Создает DTO из строки хранилища без повторной валидации.
+
+        Статус и источник проверяются при создании инцидента, поэтому при
+        чтении больших списков повторная проверка каждой строки не нужна.
+
+        Args:
+            row: Кортеж (id, text, status, source, created_at)
+
+        Returns:
+            IncidentDTO: DTO инцидента
+        """
+        incident = cls.__new__(cls)
+        incident.id, incident.text, incident.status, incident.source, incident.created_at = row
+        return incident
+
     def _validate_status(self, status: Union[IncidentStatus, str]) -> str:
         """Валидация статуса инцидента"""
         if isinstance(status, IncidentStatus):
@@ -0,0 +1,82 @@
+import threading
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from services.dto.incident_dto import IncidentDTO
+
+class IncidentCache:
+    def __init__(self, max_size: int = 10000):
+        """
+        Инициализирует ограниченный LRU-кеш инцидентов по id (identity map).
+
+        Кеш общий для процесса: при превышении max_size вытесняются давно
+        не запрашивавшиеся инциденты. Изменения статуса записываются в кеш
+        сквозным образом, поэтому он согласован с БД только в пределах
+        одного процесса.
+
+        Args:
+            max_size: Максимальное количество хранимых инцидентов
+        """
+        self.max_size = max_size
+        self._items: "OrderedDict[int, IncidentDTO]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_many(self, ids: Iterable[int]) -> Tuple[Dict[int, IncidentDTO], List[int]]:
+        """
+        Ищет инциденты в кеше.
+
+        Args:
+            ids: Идентификаторы инцидентов
+
+        Returns:
+            Tuple[Dict[int, IncidentDTO], List[int]]: Найденные инциденты по id
+                и идентификаторы, которых нет в кеше
+        """
+        found: Dict[int, IncidentDTO] = {}
+        missing: List[int] = []
+        with self._lock:
+            for id in ids:
+                incident = self._items.get(id)
+                if incident is None:
+                    missing.append(id)
+                else:
+                    self._items.move_to_end(id)
+                    found[id] = incident
+        return found, missing
+
+    def put_many(self, incidents: Iterable[IncidentDTO]) -> None:
+        """
+        Добавляет прочитанные из БД инциденты в кеш.
+
+        Args:
+            incidents: DTO инцидентов с заполненным id
+        """
+        with self._lock:
+            for incident in incidents:
+                self._items[incident.id] = incident
+                self._items.move_to_end(incident.id)
+            while len(self._items) > self.max_size:
+                self._items.popitem(last=False)
+
+    def update_status(self, id: int, new_status: str) -> None:
+        """
+        Сквозная запись нового статуса инцидента, если он есть в кеше.
+
+        DTO не изменяется на месте, а заменяется копией: ранее выданные
+        объекты могут еще сериализоваться в ответ.
+
+        Args:
+            id: Идентификатор инцидента
+            new_status: Новый статус инцидента
+        """
+        with self._lock:
+            incident: Optional[IncidentDTO] = self._items.get(id)
+            if incident is None:
+                return
+            self._items[id] = IncidentDTO(
+                id=incident.id,
+                text=incident.text,
+                status=new_status,
+                source=incident.source,
+                created_at=incident.created_at
+            )
@@ -1,19 +1,27 @@
-from typing import List
+from datetime import datetime
+from typing import Dict, List, Optional, Sequence, Tuple
+from services.dto.analytics_dto import SourceAnalyticsDTO, StatusDurationDTO
 from services.dto.incident_dto import IncidentDTO, IncidentStatus
 from services.abstract.incident_interface import IIncidentService
+from services.incident_cache import IncidentCache
 from domain.incident import Incident
 from infrastructure.abstract.database_repository_interface import IDatabaseRepository
 
+# Перцентили, рассчитываемые в аналитике статусов
+ANALYTICS_PERCENTILES = (50, 90, 99)
+
 
 class IncidentService(IIncidentService):
-    def __init__(self, repository: IDatabaseRepository):
+    def __init__(self, repository: IDatabaseRepository, cache: Optional[IncidentCache] = None):
         """
         Инициализирует сервис инцидентов.
         
         Args:
             repository: Репозиторий для работы с базой данных
+            cache: Кеш инцидентов по id для поиска по идентификатору; None - без кеша
         """
         self.repository = repository
+        self.cache = cache
 
     def create_incident(self, incident: IncidentDTO) -> None:
         """
@@ -51,22 +59,85 @@ class IncidentService(IIncidentService):
         except ValueError:
             raise ValueError(f"Недопустимый статус: {status}")
 
-        # Получение доменных моделей из репозитория
-        incidents = self.repository.get_incidents_by_status(status)
+        # Список читается кортежами: доменные объекты и повторная валидация
+        # каждой строки стоили бы больше, чем сама выборка
+        return [IncidentDTO.from_row(row) for row in self.repository.get_incident_rows_by_status(status)]
+
+    def get_incident(self, id: int) -> Optional[IncidentDTO]:
+        """
+        Возвращает инцидент по его идентификатору, сначала из кеша.
         
-        # Преобразование доменных моделей в DTO
-        incident_dtos = []
-        for incident in incidents:
-            incident_dto = IncidentDTO(
-                id=incident.id,
-                text=incident.text,
-                status=incident.status,
-                source=incident.source,
-                created_at=incident.created_at
-            )
-            incident_dtos.append(incident_dto)
+        Args:
+            id: Идентификатор инцидента
+            
+        Returns:
+            Optional[IncidentDTO]: DTO инцидента или None, если инцидент не найден
+        """
+        if self.cache is not None:
+            found, _ = self.cache.get_many((id,))
+            if id in found:
+                return found[id]
+
+        incident = self.repository.get_incident(id)
+        if incident is None:
+            return None
+
+        incident_dto = self._to_dto(incident)
+        if self.cache is not None:
+            self.cache.put_many((incident_dto,))
+        return incident_dto
+
+    def get_incidents_by_ids(self, ids: Sequence[int]) -> List[IncidentDTO]:
+        """
+        Возвращает инциденты с указанными идентификаторами.
+
+        Инциденты, которых нет в кеше, читаются из репозитория одним запросом.
+        
+        Args:
+            ids: Идентификаторы инцидентов
+            
+        Returns:
+            List[IncidentDTO]: DTO найденных инцидентов в порядке ids;
+                отсутствующие и повторяющиеся идентификаторы пропускаются
+        """
+        unique_ids = list(dict.fromkeys(ids))
+        if self.cache is not None:
+            found, missing = self.cache.get_many(unique_ids)
+        else:
+            found, missing = {}, unique_ids
+
+        if missing:
+            loaded = [self._to_dto(incident) for incident in self.repository.get_incidents_by_ids(missing)]
+            if self.cache is not None:
+                self.cache.put_many(loaded)
+            found.update((incident.id, incident) for incident in loaded)
+
+        return [found[id] for id in unique_ids if id in found]
+
+    def get_incidents_version(self, status: str) -> Tuple[int, Optional[datetime]]:
+        """
+        Возвращает версию списка инцидентов с указанным статусом.
+        
+        Args:
+            status: Статус инцидентов
+            
+        Returns:
+            Tuple[int, Optional[datetime]]: Номер версии и время последнего изменения
+                (0 и None, если список еще ни разу не изменялся)
             
-        return incident_dtos
+        Raises:
+            ValueError: Если передан недопустимый статус
+        """
+        # Валидация статуса
+        try:
+            IncidentStatus(status)
+        except ValueError:
+            raise ValueError(f"Недопустимый статус: {status}")
+
+        list_version = self.repository.get_list_version(status)
+        if list_version is None:
+            return 0, None
+        return list_version.version, list_version.updated_at
 
     def update_status(self, id: int, new_status: str) -> int:
         """
@@ -96,4 +167,52 @@ class IncidentService(IIncidentService):
         except ValueError:
             return 2
 
-        return 0
\ No newline at end of file
+        # Сквозная запись в кеш после фиксации изменения в БД
+        if self.cache is not None:
+            self.cache.update_status(id, validated_status)
+
+        return 0
+
+    def get_status_analytics(self) -> List[SourceAnalyticsDTO]:
+        """
+        Возвращает аналитику по журналу смены статусов для каждого источника.
+
+        Агрегаты считаются в БД, сервис только группирует их по источникам.
+            
+        Returns:
+            List[SourceAnalyticsDTO]: Аналитика по источникам
+        """
+        analytics: Dict[str, SourceAnalyticsDTO] = {}
+
+        for row in self.repository.get_resolution_times(ANALYTICS_PERCENTILES):
+            analytics[row["source"]] = SourceAnalyticsDTO(
+                source=row["source"],
+                resolved_count=row["resolved_count"],
+                mttr_seconds=row["mttr_seconds"],
+                resolution_percentiles=self._percentiles(row)
+            )
+
+        for row in self.repository.get_status_durations(ANALYTICS_PERCENTILES):
+            source_analytics = analytics.setdefault(row["source"], SourceAnalyticsDTO(source=row["source"]))
+            source_analytics.time_in_status.append(StatusDurationDTO(
+                status=row["status"],
+                count=row["count"],
+                avg_seconds=row["avg_seconds"],
+                percentiles=self._percentiles(row)
+            ))
+
+        return sorted(analytics.values(), key=lambda item: item.source)
+
+    def _to_dto(self, incident: Incident) -> IncidentDTO:
+        """Преобразует доменную модель инцидента в DTO"""
+        return IncidentDTO(
+            id=incident.id,
+            text=incident.text,
+            status=incident.status,
+            source=incident.source,
+            created_at=incident.created_at
+        )
+
+    def _percentiles(self, row: dict) -> Dict[int, float]:
+        """Извлекает колонки p<N>_seconds из строки аналитического запроса"""
+        return {p: row[f"p{p}_seconds"] for p in ANALYTICS_PERCENTILES}
@@ -0,0 +1,159 @@
+import asyncio
+import random
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, ContextManager, Dict, List, Optional, Tuple
+
+from infrastructure.abstract.event_sink_interface import IEventSink
+from infrastructure.abstract.outbox_repository_interface import IOutboxRepository
+
+
+class OutboxDispatcher:
+    def __init__(
+        self,
+        repository_context: Callable[[], ContextManager[IOutboxRepository]],
+        sink: IEventSink,
+        batch_size: int = 100,
+        concurrency: int = 10,
+        poll_interval: float = 1.0,
+        lease_seconds: float = 60.0,
+        max_attempts: int = 10,
+        base_backoff: float = 1.0,
+        max_backoff: float = 300.0,
+        dead_retention: float = 7 * 24 * 3600.0,
+        purge_interval: float = 3600.0
+    ):
+        """
+        Инициализирует фоновый диспетчер событий из outbox.
+
+        Args:
+            repository_context: Фабрика контекстов с репозиторием outbox
+                (каждая операция выполняется в собственной сессии)
+            sink: Получатель событий
+            batch_size: Максимальное количество событий, захватываемых за раз
+            concurrency: Максимальное количество одновременных доставок
+            poll_interval: Пауза между опросами пустого outbox, секунды
+            lease_seconds: Длительность захвата пачки, секунды
+            max_attempts: Количество попыток доставки, после которого событие
+                остается в outbox без дальнейших попыток
+            base_backoff: Начальная задержка перед повторной попыткой, секунды
+            max_backoff: Максимальная задержка перед повторной попыткой, секунды
+            dead_retention: Срок хранения событий с исчерпанными попытками
+                от момента создания, секунды; 0 - не удалять
+            purge_interval: Интервал очистки событий с исчерпанными попытками, секунды
+        """
+        self.repository_context = repository_context
+        self.sink = sink
+        self.batch_size = batch_size
+        self.concurrency = concurrency
+        self.poll_interval = poll_interval
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        self.dead_retention = dead_retention
+        self.purge_interval = purge_interval
+
+    async def run(self) -> None:
+        """
+        Бесконечный цикл доставки, запускаемый фоновой задачей в lifespan.
+
+        Пока outbox отдает полные пачки, следующая пачка забирается сразу,
+        иначе диспетчер засыпает на poll_interval. Раз в purge_interval
+        удаляются события, попытки доставки которых исчерпаны.
+        """
+        loop = asyncio.get_running_loop()
+        purged_at = None
+        while True:
+            purge_due = purged_at is None or loop.time() - purged_at >= self.purge_interval
+            if self.dead_retention > 0 and purge_due:
+                purged_at = loop.time()
+                try:
+                    await self.purge_dead_events()
+                except Exception as e:
+                    print(f"Ошибка очистки outbox: {e}")
+
+            try:
+                dispatched = await self.dispatch_once()
+            except Exception as e:
+                print(f"Ошибка диспетчера outbox: {e}")
+                dispatched = 0
+
+            if dispatched < self.batch_size:
+                await asyncio.sleep(self.poll_interval)
+
+    async def dispatch_once(self) -> int:
+        """
+        Захватывает и доставляет одну пачку событий.
+
+        Обращения к БД выполняются в пуле потоков, чтобы не блокировать
+        event loop, обслуживающий запросы API.
+
+        Returns:
+            int: Количество обработанных событий
+        """
+        events = await asyncio.to_thread(self._claim)
+        if not events:
+            return 0
+
+        semaphore = asyncio.Semaphore(self.concurrency)
+        errors = await asyncio.gather(*(self._deliver(event, semaphore) for event in events))
+
+        delivered = [event["id"] for event, error in zip(events, errors) if error is None]
+        failed = [(event, error) for event, error in zip(events, errors) if error is not None]
+        await asyncio.to_thread(self._complete, delivered, failed)
+
+        return len(events)
+
+    async def purge_dead_events(self) -> int:
+        """
+        Удаляет события с исчерпанными попытками старше dead_retention.
+
+        Returns:
+            int: Количество удаленных событий
+        """
+        created_before = datetime.now(timezone.utc) - timedelta(seconds=self.dead_retention)
+        return await asyncio.to_thread(self._purge, created_before)
+
+    async def _deliver(self, event: Dict[str, Any], semaphore: asyncio.Semaphore) -> Optional[str]:
+        """
+        Доставляет событие с ограничением параллельности.
+
+        Returns:
+            Optional[str]: Описание ошибки или None при успешной доставке
+        """
+        async with semaphore:
+            try:
+                await self.sink.deliver(event)
+                return None
+            except Exception as e:
+                return f"{type(e).__name__}: {e}"
+
+    def _claim(self) -> List[Dict[str, Any]]:
+        with self.repository_context() as repository:
+            return repository.claim_batch(self.batch_size, self.lease_seconds)
+
+    def _purge(self, created_before: datetime) -> int:
+        with self.repository_context() as repository:
+            return repository.purge_dead_events(created_before)
+
+    def _complete(self, delivered: List[int], failed: List[Tuple[Dict[str, Any], str]]) -> None:
+        with self.repository_context() as repository:
+            repository.delete_events(delivered)
+            for event, error in failed:
+                repository.reschedule_event(event["id"], error, self._next_attempt_at(event["attempts"] + 1))
+
+    def _next_attempt_at(self, attempts: int) -> Optional[datetime]:
+        """
+        Рассчитывает момент следующей попытки с экспоненциальной задержкой и джиттером.
+
+        Args:
+            attempts: Количество уже выполненных попыток
+
+        Returns:
+            Optional[datetime]: Момент следующей попытки или None, если попытки исчерпаны
+        """
+        if attempts >= self.max_attempts:
+            return None
+        delay = min(self.max_backoff, self.base_backoff * 2 ** (attempts - 1))
+        delay *= random.uniform(0.5, 1.0)
+        return datetime.now(timezone.utc) + timedelta(seconds=delay)
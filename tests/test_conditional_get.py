@@ -0,0 +1,127 @@
+"""
+Тесты условных запросов списка инцидентов: ETag, If-None-Match,
+If-Modified-Since и смена ETag после записи.
+
+Приложение запускается без lifespan, сервис инцидентов подменяется
+сервисом поверх SQLite во временном файле.
+"""
+from datetime import timedelta
+from email.utils import format_datetime, parsedate_to_datetime
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from domain.incident import Base
+from infrastructure.database_repository import DatabaseRepository
+from infrastructure.dependency_provider import get_incident_service
+from main import app
+from services.incident_service import IncidentService
+
+
+@pytest.fixture
+def client(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'incidents.db'}")
+    Base.metadata.create_all(bind=engine)
+    session_factory = sessionmaker(bind=engine)
+
+    def incident_service():
+        with session_factory() as session:
+            yield IncidentService(repository=DatabaseRepository(session=session, outbox_enabled=False))
+
+    app.dependency_overrides[get_incident_service] = incident_service
+    yield TestClient(app)
+    app.dependency_overrides.clear()
+    engine.dispose()
+
+
+def _list(client, status="pending", **headers):
+    return client.get("/incidents/", params={"status": status}, headers=headers)
+
+
+def _create(client, text="Не работает оплата"):
+    response = client.post("/incidents/", json={"text": text, "source": "operator"})
+    assert response.status_code == 201
+
+
+def test_list_response_carries_validators(client):
+    response = _list(client)
+
+    assert response.status_code == 200
+    assert response.json() == []
+    assert response.headers["etag"] == '"pending-0"'
+    assert response.headers["cache-control"] == "no-cache"
+    assert parsedate_to_datetime(response.headers["last-modified"]).tzinfo is not None
+    assert _list(client, status="in progress").headers["etag"] == '"in-progress-0"'
+
+
+@pytest.mark.parametrize("if_none_match", [
+    '"pending-1"',
+    'W/"pending-1"',
+    '"solved-7", W/"pending-1"',
+    "*",
+])
+def test_matching_if_none_match_returns_304(client, if_none_match):
+    _create(client)
+
+    response = _list(client, **{"If-None-Match": if_none_match})
+
+    assert response.status_code == 304
+    assert response.content == b""
+    assert response.headers["etag"] == '"pending-1"'
+
+
+def test_stale_if_none_match_returns_the_list(client):
+    _create(client)
+
+    response = _list(client, **{"If-None-Match": '"pending-0", W/"solved-1"'})
+
+    assert response.status_code == 200
+    assert [incident["text"] for incident in response.json()] == ["Не работает оплата"]
+
+
+def test_if_modified_since_is_compared_with_second_precision(client):
+    _create(client)
+    last_modified = _list(client).headers["last-modified"]
+    moment = parsedate_to_datetime(last_modified)
+
+    # Время изменения хранится с микросекундами, но сравнивается с точностью
+    # до секунды, переданной в Last-Modified
+    assert _list(client, **{"If-Modified-Since": last_modified}).status_code == 304
+    later = format_datetime(moment + timedelta(seconds=1), usegmt=True)
+    assert _list(client, **{"If-Modified-Since": later}).status_code == 304
+    earlier = format_datetime(moment - timedelta(seconds=1), usegmt=True)
+    assert _list(client, **{"If-Modified-Since": earlier}).status_code == 200
+    assert _list(client, **{"If-Modified-Since": "not a date"}).status_code == 200
+
+
+def test_if_none_match_takes_precedence_over_if_modified_since(client):
+    _create(client)
+    last_modified = _list(client).headers["last-modified"]
+
+    response = _list(client, **{"If-None-Match": '"pending-0"', "If-Modified-Since": last_modified})
+
+    assert response.status_code == 200
+
+
+def test_etag_changes_after_create_and_status_update(client):
+    etag = _list(client).headers["etag"]
+
+    _create(client)
+    response = _list(client, **{"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["etag"] == '"pending-1"'
+
+    solved_etag = _list(client, status="solved").headers["etag"]
+    assert client.patch("/incidents/1/status", json={"new_status": "solved"}).status_code == 200
+
+    # Инцидент покинул список pending и попал в solved: меняются оба ETag
+    pending = _list(client, **{"If-None-Match": '"pending-1"'})
+    assert pending.status_code == 200
+    assert pending.json() == []
+    assert pending.headers["etag"] == '"pending-2"'
+    solved = _list(client, status="solved", **{"If-None-Match": solved_etag})
+    assert solved.status_code == 200
+    assert solved.headers["etag"] == '"solved-1"'
+    assert [incident["id"] for incident in solved.json()] == [1]
@@ -0,0 +1,119 @@
+"""
+Тесты кеша инцидентов по id и его использования сервисом инцидентов.
+
+Сервис работает поверх репозитория в памяти, который запоминает
+обращения за инцидентами по id.
+"""
+import pytest
+
+from domain.incident import Incident
+from infrastructure.memory_repository import InMemoryDatabaseRepository
+from services.dto.incident_dto import IncidentDTO
+from services.incident_cache import IncidentCache
+from services.incident_service import IncidentService
+
+
+class RecordingRepository(InMemoryDatabaseRepository):
+    """Репозиторий в памяти, запоминающий запрошенные по id инциденты"""
+
+    def __init__(self):
+        super().__init__(data_dir=None)
+        self.lookups = []
+
+    def get_incident(self, id):
+        self.lookups.append([id])
+        return super().get_incident(id)
+
+    def get_incidents_by_ids(self, ids):
+        self.lookups.append(list(ids))
+        return super().get_incidents_by_ids(ids)
+
+
+@pytest.fixture
+def repository():
+    repository = RecordingRepository()
+    for number in range(1, 6):
+        repository.create_incident(Incident(text=f"incident {number}", status="pending", source="operator"))
+    yield repository
+    repository.close()
+
+
+@pytest.fixture
+def service(repository):
+    return IncidentService(repository=repository, cache=IncidentCache(max_size=3))
+
+
+def _dto(id, status="pending"):
+    return IncidentDTO(id=id, text=f"incident {id}", status=status, source="operator")
+
+
+def test_cache_evicts_least_recently_used_incidents():
+    cache = IncidentCache(max_size=2)
+    cache.put_many([_dto(1), _dto(2)])
+
+    # Обращение к 1 делает давно не запрашивавшимся инцидент 2
+    cache.get_many([1])
+    cache.put_many([_dto(3)])
+
+    found, missing = cache.get_many([1, 2, 3])
+    assert sorted(found) == [1, 3]
+    assert missing == [2]
+
+    cache.put_many([_dto(4), _dto(5), _dto(6)])
+    found, missing = cache.get_many([1, 3, 4, 5, 6])
+    assert sorted(found) == [5, 6]
+    assert missing == [1, 3, 4]
+
+
+def test_get_incident_is_served_from_the_cache(service, repository):
+    first = service.get_incident(2)
+    second = service.get_incident(2)
+
+    assert second is first
+    assert (second.id, second.text) == (2, "incident 2")
+    assert repository.lookups == [[2]]
+
+    # Отсутствующие инциденты не кешируются
+    assert service.get_incident(42) is None
+    assert service.get_incident(42) is None
+    assert repository.lookups == [[2], [42], [42]]
+
+
+def test_update_status_writes_through_to_the_cache(service, repository):
+    cached = service.get_incident(1)
+
+    assert service.update_status(1, "solved") == 0
+
+    updated = service.get_incident(1)
+    assert updated.status == "solved"
+    assert (updated.id, updated.text, updated.created_at) == (cached.id, cached.text, cached.created_at)
+    # Ранее выданный DTO не изменяется
+    assert cached.status == "pending"
+    assert repository.lookups == [[1]]
+
+    # Инцидент, которого не было в кеше, в него не добавляется
+    assert service.update_status(2, "solved") == 0
+    assert service.get_incident(2).status == "solved"
+    assert repository.lookups == [[1], [2]]
+
+
+def test_get_incidents_by_ids_keeps_order_and_skips_duplicates(service, repository):
+    incidents = service.get_incidents_by_ids([3, 1, 3, 99, 2, 1])
+
+    assert [incident.id for incident in incidents] == [3, 1, 2]
+    assert repository.lookups == [[3, 1, 99, 2]]
+
+    # Из репозитория читаются только инциденты, которых нет в кеше
+    incidents = service.get_incidents_by_ids([2, 4, 2])
+    assert [incident.id for incident in incidents] == [2, 4]
+    assert repository.lookups == [[3, 1, 99, 2], [4]]
+
+
+def test_service_without_cache_reads_the_repository_every_time(repository):
+    service = IncidentService(repository=repository)
+
+    service.get_incident(1)
+    service.get_incident(1)
+    assert [incident.id for incident in service.get_incidents_by_ids([5, 1, 5])] == [5, 1]
+
+    assert repository.lookups == [[1], [1], [5, 1]]
@@ -0,0 +1,172 @@
+"""
+Тесты outbox: захват пачек с арендой, удаление доставленных событий,
+повторы с экспоненциальной задержкой и прекращение доставки после
+исчерпания попыток. Используется SQLite во временном файле.
+"""
+import asyncio
+import json
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import create_engine, select, update
+from sqlalchemy.orm import sessionmaker
+
+from domain.incident import Base, Incident
+from domain.outbox_event import OutboxEvent
+from infrastructure.abstract.event_sink_interface import IEventSink
+from infrastructure.database_repository import DatabaseRepository
+from infrastructure.event_sinks import FileEventSink
+from infrastructure.outbox_repository import OutboxRepository
+from services.outbox_dispatcher import OutboxDispatcher
+
+
+class FailingEventSink(IEventSink):
+    """Получатель, отклоняющий каждое событие"""
+
+    def __init__(self):
+        self.attempts = 0
+
+    async def deliver(self, event):
+        self.attempts += 1
+        raise RuntimeError("sink is down")
+
+
+@pytest.fixture
+def session_factory(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'incidents.db'}")
+    Base.metadata.create_all(bind=engine)
+    yield sessionmaker(bind=engine)
+    engine.dispose()
+
+
+@pytest.fixture
+def repository_context(session_factory):
+    @contextmanager
+    def context():
+        session = session_factory()
+        try:
+            yield OutboxRepository(session=session)
+        finally:
+            session.close()
+
+    return context
+
+
+def _create_incidents(session_factory, count):
+    with session_factory() as session:
+        repository = DatabaseRepository(session=session)
+        for number in range(count):
+            repository.create_incident(Incident(text=f"incident {number}", status="pending", source="operator"))
+
+
+def _events(session_factory):
+    with session_factory() as session:
+        return session.execute(select(OutboxEvent).order_by(OutboxEvent.id)).scalars().all()
+
+
+def _make_ready(session_factory):
+    """Переносит следующую попытку в прошлое, чтобы не ждать задержку"""
+    past = datetime.now(timezone.utc) - timedelta(seconds=1)
+    with session_factory() as session:
+        session.execute(
+            update(OutboxEvent).where(OutboxEvent.next_attempt_at.is_not(None)).values(next_attempt_at=past)
+        )
+        session.commit()
+
+
+def _utcnow():
+    # SQLite возвращает время без часового пояса
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def test_repository_writes_no_events_when_outbox_is_disabled(session_factory):
+    with session_factory() as session:
+        repository = DatabaseRepository(session=session, outbox_enabled=False)
+        repository.create_incident(Incident(text="first", status="pending", source="operator"))
+        repository.update_incident_status(1, "solved")
+
+    assert _events(session_factory) == []
+
+
+def test_claim_batch_leases_events_until_the_lease_expires(session_factory, repository_context):
+    _create_incidents(session_factory, 3)
+
+    with repository_context() as first, repository_context() as second:
+        assert [event["id"] for event in first.claim_batch(2, lease_seconds=60)] == [1, 2]
+        # Захваченные события не достаются другому диспетчеру
+        assert [event["id"] for event in second.claim_batch(10, lease_seconds=60)] == [3]
+        assert second.claim_batch(10, lease_seconds=60) == []
+
+    _create_incidents(session_factory, 1)
+    with repository_context() as repository:
+        claimed = repository.claim_batch(10, lease_seconds=-1)
+        assert [event["id"] for event in claimed] == [4]
+        assert claimed[0]["event_type"] == "incident.created"
+        assert claimed[0]["payload"]["incident"]["text"] == "incident 0"
+        assert claimed[0]["attempts"] == 0
+        # Аренда истекла: событие снова доступно для захвата
+        assert [event["id"] for event in repository.claim_batch(10, lease_seconds=60)] == [4]
+
+
+def test_delivered_events_are_written_to_the_sink_and_deleted(tmp_path, session_factory, repository_context):
+    _create_incidents(session_factory, 3)
+    with session_factory() as session:
+        DatabaseRepository(session=session).update_incident_status(2, "solved")
+    path = tmp_path / "events.ndjson"
+    dispatcher = OutboxDispatcher(repository_context, FileEventSink(str(path)), batch_size=10)
+
+    assert asyncio.run(dispatcher.dispatch_once()) == 4
+
+    delivered = [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+    assert sorted((event["id"], event["event_type"], event["incident_id"]) for event in delivered) == [
+        (1, "incident.created", 1),
+        (2, "incident.created", 2),
+        (3, "incident.created", 3),
+        (4, "incident.status_changed", 2),
+    ]
+    assert _events(session_factory) == []
+    assert asyncio.run(dispatcher.dispatch_once()) == 0
+
+
+def test_failed_events_are_retried_with_backoff_until_attempts_are_exhausted(session_factory, repository_context):
+    _create_incidents(session_factory, 1)
+    sink = FailingEventSink()
+    dispatcher = OutboxDispatcher(repository_context, sink, max_attempts=3, base_backoff=10.0, max_backoff=15.0)
+
+    # Задержка удваивается от попытки к попытке (10 с, затем 20 с, ограничено 15 с)
+    # и уменьшается джиттером не более чем вдвое
+    for attempts, delay in ((1, 10.0), (2, 15.0)):
+        before = _utcnow()
+        assert asyncio.run(dispatcher.dispatch_once()) == 1
+        (event,) = _events(session_factory)
+        assert event.attempts == attempts
+        assert event.last_error == "RuntimeError: sink is down"
+        assert event.claim_token is None and event.claimed_until is None
+        assert before + timedelta(seconds=delay * 0.5) <= event.next_attempt_at
+        assert event.next_attempt_at <= _utcnow() + timedelta(seconds=delay)
+        # До наступления следующей попытки событие не захватывается
+        assert asyncio.run(dispatcher.dispatch_once()) == 0
+        _make_ready(session_factory)
+
+    assert asyncio.run(dispatcher.dispatch_once()) == 1
+    (event,) = _events(session_factory)
+    assert event.attempts == 3
+    assert event.next_attempt_at is None
+    assert asyncio.run(dispatcher.dispatch_once()) == 0
+    assert sink.attempts == 3
+
+
+def test_dead_events_are_purged_after_the_retention(session_factory, repository_context):
+    _create_incidents(session_factory, 2)
+    dispatcher = OutboxDispatcher(repository_context, FailingEventSink(), max_attempts=1, dead_retention=3600.0)
+    with repository_context() as repository:
+        (event, _) = repository.claim_batch(10, lease_seconds=60)
+        repository.reschedule_event(event["id"], "RuntimeError: sink is down", None)
+
+    assert asyncio.run(dispatcher.purge_dead_events()) == 0
+
+    dispatcher.dead_retention = -1.0
+    assert asyncio.run(dispatcher.purge_dead_events()) == 1
+    # Событие, ожидающее повторной попытки, не удаляется
+    assert [event.id for event in _events(session_factory)] == [2]
@@ -0,0 +1,266 @@
+"""
+Контрактные тесты репозиториев инцидентов.
+
+Одни и те же проверки выполняются для DatabaseRepository (SQLite во временном
+файле) и InMemoryDatabaseRepository (журнал и снимки во временном каталоге).
+"""
+import os
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from domain.incident import Base, Incident
+from infrastructure.database_repository import DatabaseRepository, check_dialect_supported
+from infrastructure.memory_repository import InMemoryDatabaseRepository
+
+PERCENTILES = (50, 90, 99)
+
+
+@pytest.fixture(params=["sql", "memory"])
+def repository(request, tmp_path):
+    if request.param == "sql":
+        engine = create_engine(f"sqlite:///{tmp_path / 'incidents.db'}")
+        Base.metadata.create_all(bind=engine)
+        session = sessionmaker(bind=engine)()
+        yield DatabaseRepository(session=session)
+        session.close()
+        engine.dispose()
+    else:
+        repository = InMemoryDatabaseRepository(data_dir=str(tmp_path / "data"))
+        yield repository
+        repository.close()
+
+
+def _create(repository, text, status="pending", source="operator", created_at=None):
+    incident = Incident(text=text, status=status, source=source, created_at=created_at)
+    repository.create_incident(incident)
+    return incident.id
+
+
+def _version(repository, status):
+    list_version = repository.get_list_version(status)
+    return list_version.version if list_version is not None else 0
+
+
+def _fields(incident):
+    return incident.id, incident.text, incident.status, incident.source
+
+
+def test_create_assigns_sequential_ids_and_lists_by_status_in_id_order(repository):
+    ids = [
+        _create(repository, "first"),
+        _create(repository, "second", status="solved"),
+        _create(repository, "third", source="partner"),
+    ]
+
+    assert ids == [1, 2, 3]
+    assert [_fields(i) for i in repository.get_incidents_by_status("pending")] == [
+        (1, "first", "pending", "operator"),
+        (3, "third", "pending", "partner"),
+    ]
+    assert repository.get_incidents_by_status("in progress") == []
+
+
+def test_incident_rows_match_domain_objects(repository):
+    created_at = datetime(2024, 5, 1, 12, 30, tzinfo=timezone.utc)
+    _create(repository, "first", created_at=created_at)
+    _create(repository, "second", status="solved")
+    _create(repository, "third", source="monitoring", created_at=created_at)
+
+    rows = repository.get_incident_rows_by_status("pending")
+
+    assert [tuple(row[:4]) for row in rows] == [
+        _fields(i) for i in repository.get_incidents_by_status("pending")
+    ]
+    # Оба репозитория возвращают время в UTC без часового пояса
+    assert [row[4] for row in rows] == [datetime(2024, 5, 1, 12, 30)] * 2
+    assert repository.get_incident(1).created_at == datetime(2024, 5, 1, 12, 30)
+    assert repository.get_incident_rows_by_status("in progress") == []
+
+
+def test_update_status_moves_incident_between_lists(repository):
+    _create(repository, "first")
+    _create(repository, "second")
+
+    repository.update_incident_status(1, "in progress")
+
+    assert [i.id for i in repository.get_incidents_by_status("pending")] == [2]
+    assert [i.id for i in repository.get_incidents_by_status("in progress")] == [1]
+    assert repository.get_incident(1).status == "in progress"
+
+
+def test_update_to_same_status_is_a_no_op(repository):
+    _create(repository, "first")
+    version = _version(repository, "pending")
+
+    repository.update_incident_status(1, "pending")
+
+    assert _version(repository, "pending") == version
+    assert repository.get_status_durations(PERCENTILES) == []
+
+
+def test_update_unknown_incident_raises_value_error(repository):
+    _create(repository, "first")
+
+    with pytest.raises(ValueError):
+        repository.update_incident_status(42, "solved")
+
+
+def test_list_versions_are_bumped_by_every_change(repository):
+    assert _version(repository, "pending") == 0
+
+    _create(repository, "first")
+    _create(repository, "second")
+    assert _version(repository, "pending") == 2
+    assert _version(repository, "solved") == 0
+
+    repository.update_incident_status(1, "solved")
+    assert _version(repository, "pending") == 3
+    assert _version(repository, "solved") == 1
+    assert repository.get_list_version("solved").updated_at is not None
+
+
+def test_list_versions_are_seeded_with_the_table(tmp_path):
+    """Версии увеличиваются через UPDATE: строки статусов создаются вместе с таблицей"""
+    engine = create_engine(f"sqlite:///{tmp_path / 'incidents.db'}")
+    Base.metadata.create_all(bind=engine)
+    session = sessionmaker(bind=engine)()
+    repository = DatabaseRepository(session=session)
+
+    for status in ("pending", "in progress", "solved"):
+        assert repository.get_list_version(status).version == 0
+    _create(repository, "first")
+    assert repository.get_list_version("pending").version == 1
+
+    session.close()
+    engine.dispose()
+
+
+def test_get_incident_by_id(repository):
+    _create(repository, "first")
+    _create(repository, "second", source="partner")
+
+    assert _fields(repository.get_incident(2)) == (2, "second", "pending", "partner")
+    assert repository.get_incident(3) is None
+
+
+def test_get_incidents_by_ids_skips_missing(repository):
+    for number in range(5):
+        _create(repository, f"incident {number}")
+
+    incidents = repository.get_incidents_by_ids([4, 99, 1, 2])
+
+    assert sorted(i.id for i in incidents) == [1, 2, 4]
+    assert repository.get_incidents_by_ids([]) == []
+    assert repository.get_incidents_by_ids([100]) == []
+
+
+def test_analytics_match_between_backends(tmp_path):
+    """Оба репозитория считают одинаковые строки аналитики по одной истории"""
+    engine = create_engine(f"sqlite:///{tmp_path / 'incidents.db'}")
+    Base.metadata.create_all(bind=engine)
+    session = sessionmaker(bind=engine)()
+    memory = InMemoryDatabaseRepository(data_dir=None)
+
+    now = datetime.now(timezone.utc)
+    history = [
+        ("operator", 1, ["in progress", "solved"]),
+        ("operator", 3, ["solved"]),
+        ("operator", 5, ["in progress"]),
+        ("partner", 2, ["in progress", "pending", "solved"]),
+        ("partner", 7, []),
+        ("monitoring", 4, ["solved", "in progress", "solved"]),
+    ]
+    results = []
+    for repository in (DatabaseRepository(session=session), memory):
+        for number, (source, hours_ago, transitions) in enumerate(history, start=1):
+            _create(repository, f"incident {number}", source=source, created_at=now - timedelta(hours=hours_ago))
+            for status in transitions:
+                repository.update_incident_status(number, status)
+        results.append((
+            repository.get_status_durations(PERCENTILES),
+            repository.get_resolution_times(PERCENTILES),
+        ))
+    session.close()
+    engine.dispose()
+
+    (sql_durations, sql_resolutions), (memory_durations, memory_resolutions) = results
+    assert len(sql_durations) == len(memory_durations) == 7
+    assert len(sql_resolutions) == len(memory_resolutions) == 3
+    # Переходы выполняются в разные моменты для двух репозиториев,
+    # поэтому длительности (часы) сравниваются с точностью до секунд
+    for sql_rows, memory_rows in ((sql_durations, memory_durations), (sql_resolutions, memory_resolutions)):
+        for sql_row, memory_row in zip(sql_rows, memory_rows):
+            assert sql_row.keys() == memory_row.keys()
+            for key, value in sql_row.items():
+                if isinstance(value, float):
+                    assert memory_row[key] == pytest.approx(value, abs=5)
+                else:
+                    assert memory_row[key] == value
+
+
+def test_unsupported_dialect_is_rejected():
+    check_dialect_supported("sqlite")
+    check_dialect_supported("postgresql")
+
+    with pytest.raises(ValueError, match="mysql"):
+        check_dialect_supported("mysql")
+
+
+def _state(repository):
+    incidents = repository.get_incidents_by_ids(range(1, 1000))
+    return (
+        [_fields(i) for i in incidents],
+        {status: _version(repository, status) for status in ("pending", "in progress", "solved")},
+        repository.get_status_durations(PERCENTILES),
+    )
+
+
+def test_memory_repository_restores_from_snapshot_and_log(tmp_path):
+    data_dir = str(tmp_path / "data")
+    repository = InMemoryDatabaseRepository(data_dir=data_dir, snapshot_every=4)
+    for number in range(10):
+        _create(repository, f"incident {number}", source="partner" if number % 2 else "operator")
+    for id in (2, 5, 7):
+        repository.update_incident_status(id, "solved")
+    repository._wait_for_snapshot()
+    expected = _state(repository)
+
+    # Процесс "падает": снимок и журнал не сбрасываются через close()
+    assert os.path.exists(os.path.join(data_dir, "snapshot.json"))
+    restored = InMemoryDatabaseRepository(data_dir=data_dir, snapshot_every=4)
+
+    assert _state(restored) == expected
+    restored.close()
+
+    # После штатной остановки все состояние находится в снимке
+    reopened = InMemoryDatabaseRepository(data_dir=data_dir)
+    assert _state(reopened) == expected
+    reopened.close()
+
+
+def test_memory_repository_drops_torn_final_log_line(tmp_path):
+    data_dir = str(tmp_path / "data")
+    repository = InMemoryDatabaseRepository(data_dir=data_dir)
+    _create(repository, "first")
+    _create(repository, "second")
+    expected = _state(repository)
+    repository._log_file.flush()
+
+    # Запись, оборванная при падении процесса
+    with open(os.path.join(data_dir, "log.ndjson"), "a", encoding="utf-8") as log:
+        log.write('{"seq": 3, "op": "create", "text": "thi')
+
+    restored = InMemoryDatabaseRepository(data_dir=data_dir)
+    assert _state(restored) == expected
+
+    # Новые записи не склеиваются с отброшенной строкой
+    assert _create(restored, "third") == 3
+    restored._log_file.flush()
+    reopened = InMemoryDatabaseRepository(data_dir=data_dir)
+    assert [i.text for i in reopened.get_incidents_by_status("pending")] == ["first", "second", "third"]
+    reopened.close()
+    restored._log_file.close()
+    repository._log_file.close()